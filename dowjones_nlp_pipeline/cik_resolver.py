@@ -0,0 +1,124 @@
+import os
+import json
+from functools import lru_cache
+import pandas as pd
+from config import CIK_dict, COMPANY_TICKERS_PATH, SEC_COMPANY_TICKERS_URL, TICKER_HISTORY_PATH
+
+
+def normalize_ticker(ticker):
+    """Upper-case ticker with share classes written SEC-style ("BRK.B" -> "BRK-B")."""
+    return str(ticker).strip().upper().replace(".", "-")
+
+
+class CIKResolver:
+    """
+    Ticker -> CIK lookup for any listed company.
+
+    Tickers resolve, in order, through the point-in-time history in
+    data/reference/ticker_history.csv (when an as_of date is given), the hand-kept
+    overrides (CIK_dict), SEC's company_tickers.json (cached locally, downloaded on
+    first use when download=True), and finally the most recent history entry, so
+    retired tickers such as UTX or FB still resolve.
+    """
+
+    def __init__(self, path=COMPANY_TICKERS_PATH, history_path=TICKER_HISTORY_PATH, overrides=None,
+                 download=True, downloader=None):
+        self.path = path
+        self.download = download
+        self.downloader = downloader
+        self.overrides = {normalize_ticker(t): int(c) for t, c in (CIK_dict if overrides is None else overrides).items()}
+        self._sec = None
+
+        if history_path and os.path.exists(history_path):
+            history = pd.read_csv(history_path, parse_dates=["Start Date", "End Date"])
+            history["Ticker"] = history["Ticker"].map(normalize_ticker)
+            self.history = history.sort_values(["Ticker", "Start Date"], na_position="first")
+        else:
+            self.history = pd.DataFrame(columns=["Ticker", "CIK", "Start Date", "End Date"])
+        self._history = {t: list(zip(g["CIK"].astype(int), g["Start Date"], g["End Date"]))
+                         for t, g in self.history.groupby("Ticker")}
+
+    # -----------------------------
+    # SEC ticker file
+    # -----------------------------
+    def refresh(self):
+        """Download SEC's current company_tickers.json into the local cache."""
+        if self.downloader is None:
+            from edgar_downloader import EdgarDownloader
+            self.downloader = EdgarDownloader()
+        resp = self.downloader.get(SEC_COMPANY_TICKERS_URL)
+        if resp.status_code != 200:
+            print(f"⚠️ Could not download company tickers — HTTP {resp.status_code}")
+            return self
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "wb") as f:
+            f.write(resp.content)
+        self._sec = None
+        return self
+
+    @property
+    def sec(self):
+        """{ticker: cik} from the cached SEC file (first listed ticker wins), loaded once."""
+        if self._sec is None:
+            if not os.path.exists(self.path) and self.download:
+                self.refresh()
+            self._sec = {}
+            self._titles = {}
+            if os.path.exists(self.path):
+                with open(self.path) as f:
+                    for entry in json.load(f).values():
+                        ticker = normalize_ticker(entry["ticker"])
+                        self._sec.setdefault(ticker, int(entry["cik_str"]))
+                        self._titles.setdefault(int(entry["cik_str"]), entry.get("title"))
+        return self._sec
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def resolve(self, ticker, as_of=None):
+        """CIK (int) of ticker, as of a date if given; None if it cannot be resolved."""
+        ticker = normalize_ticker(ticker)
+        entries = self._history.get(ticker, [])
+        if as_of is not None:
+            as_of = pd.Timestamp(as_of)
+            for cik, start, end in entries:
+                if (pd.isna(start) or start <= as_of) and (pd.isna(end) or as_of <= end):
+                    return cik
+        if ticker in self.overrides:
+            return self.overrides[ticker]
+        if ticker in self.sec:
+            return self.sec[ticker]
+        return entries[-1][0] if entries else None
+
+    def resolve_many(self, tickers, as_of=None):
+        """{ticker: cik} for every ticker that resolves; the others are reported and left out."""
+        ciks = {}
+        for ticker in tickers:
+            cik = self.resolve(ticker, as_of)
+            if cik is None:
+                print(f"⚠️ No CIK found for {ticker}")
+                continue
+            ciks[ticker] = cik
+        return ciks
+
+    def aliases(self, ticker):
+        """Other tickers that have belonged to the same company (e.g. "UTX" for "RTX")."""
+        cik = self.resolve(ticker)
+        if cik is None:
+            return []
+        ticker = normalize_ticker(ticker)
+        names = [t for t, entries in self._history.items() if any(c == cik for c, _, _ in entries)]
+        names += [t for t, c in self.overrides.items() if c == cik]
+        names += [t for t, c in self.sec.items() if c == cik]
+        return [t for t in dict.fromkeys(names) if t != ticker]
+
+    def title(self, cik):
+        """Company name in SEC's ticker file, if listed."""
+        self.sec
+        return self._titles.get(int(cik))
+
+
+@lru_cache(maxsize=None)
+def get_resolver(download=False):
+    """Process-wide resolver; by default it only reads the local cache and never downloads."""
+    return CIKResolver(download=download)
@@ -68,6 +68,36 @@ CIK_dict = {
     "WBA": "1618921"
 }
 
+# -----------------------------
+# Text Metrics Workers
+# -----------------------------
+# Processes used by analyze_filings (1 = serial, None = one per CPU core)
+TEXT_METRICS_WORKERS = None
+# Characters read per chunk when analyze_filings runs with stream=True
+TEXT_METRICS_CHUNK_SIZE = 1 << 20
+# Tokenizer backend: "punkt" (nltk, highest fidelity) or "regex" (single compiled-regex pass, faster)
+TEXT_METRICS_TOKENIZER = "punkt"
+
+# -----------------------------
+# Syllable Table
+# -----------------------------
+# Compact syllable counts built once from cmudict (python -m utils.syllable_table)
+SYLLABLE_TABLE_PATH = "data/processed/syllable_table"
+
+# -----------------------------
+# Metrics Cache
+# -----------------------------
+# Content-addressed store of per-filing text metrics (analyze_filings(cache=True))
+METRICS_CACHE_PATH = "data/processed/metrics_cache.sqlite"
+
+# -----------------------------
+# Filing Similarity
+# -----------------------------
+# Per-filing hashed term vectors + MinHash signatures for year-over-year similarity
+SIMILARITY_PATH = "data/processed/similarity"
+SIMILARITY_N_FEATURES = 2 ** 20
+MINHASH_PERMUTATIONS = 128
+
 # -----------------------------
 # Days After Filing 10-K
 # -----------------------------
@@ -80,3 +110,106 @@ BASE_TICKER = "JPM"
 START_DATE = date(2010, 1, 1)
 END_DATE = date(2024, 12, 31)
 AUTO_ADJUST = False
+
+# -----------------------------
+# Full-Text Index
+# -----------------------------
+# Inverted index (term -> filing postings with positions) over the cleaned filing tokens
+FULLTEXT_INDEX_PATH = "data/processed/fulltext_index.sqlite"
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+# Synthetic filings and JSON results of text_metrics_benchmark.py
+BENCHMARK_PATH = "data/processed/benchmarks"
+
+# -----------------------------
+# Filing Corpus
+# -----------------------------
+# Filings stored by {ticker}/{year}/{form}_{accession}.txt.gz, with a manifest.parquet
+SEC_CORPUS_PATH = "data/raw/sec_corpus"
+# Columnar panel of text metrics, one row per (accession, scoring options)
+CORPUS_METRICS_PATH = "data/processed/filing_metrics.parquet"
+
+# -----------------------------
+# EDGAR Downloads
+# -----------------------------
+# Base of every EDGAR Archives URL (point at a local server to test the downloader)
+SEC_ARCHIVES_URL = "https://www.sec.gov/Archives"
+# SEC fair-access limit
+SEC_MAX_REQUESTS_PER_SECOND = 10
+EDGAR_DOWNLOAD_WORKERS = 8
+EDGAR_MAX_RETRIES = 5
+# Completed downloads (JSON lines), used to resume interrupted bulk downloads
+EDGAR_DOWNLOAD_MANIFEST = "data/raw/sec_filings/download_manifest.jsonl"
+
+# -----------------------------
+# EDGAR Master Index
+# -----------------------------
+# Parsed full-index master.idx files, one Parquet file per year and quarter
+MASTER_INDEX_PATH = "data/raw/master_index"
+
+# -----------------------------
+# Filing Storage
+# -----------------------------
+# Downloaded filings are stored as {accession}.txt.gz (stdlib gzip); False keeps plain .txt
+FILING_COMPRESSION = True
+FILING_COMPRESSLEVEL = 6
+
+# -----------------------------
+# Ticker -> CIK Resolution
+# -----------------------------
+# SEC's ticker/CIK mapping for every listed company, cached locally
+SEC_COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+COMPANY_TICKERS_PATH = "data/raw/company_tickers.json"
+# Point-in-time ticker -> CIK history (renames, reorganizations)
+TICKER_HISTORY_PATH = "data/reference/ticker_history.csv"
+
+# -----------------------------
+# Financial Statement Data Sets
+# -----------------------------
+# Local copies of SEC's quarterly {year}q{n}.zip archives (sub.txt / num.txt / tag.txt)
+FSDS_PATH = "data/raw/fsds"
+# (CIK, Tag, Period) panel of XBRL facts for the universe
+FUNDAMENTALS_PATH = "data/processed/fundamentals.parquet"
+
+# -----------------------------
+# Daily Index Ingestion
+# -----------------------------
+# Last EDGAR daily-index date ingested, and filings waiting for download + analysis
+DAILY_INDEX_STATE_PATH = "data/raw/master_index/daily_state.json"
+FILING_QUEUE_PATH = "data/raw/master_index/filing_queue.parquet"
+
+# -----------------------------
+# Price Store
+# -----------------------------
+# One Parquet file of daily auto-adjusted bars per ticker, plus coverage.json
+PRICE_STORE_PATH = "data/raw/prices"
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# -----------------------------
+# Price Broker
+# -----------------------------
+# Shared yfinance access: tickers per multi-ticker download, and download threads
+PRICE_BROKER_BATCH_SIZE = 50
+PRICE_BROKER_WORKERS = 4
+
+# -----------------------------
+# Return Panel
+# -----------------------------
+# Aligned dates x tickers daily returns saved as memory-mappable .npy files
+RETURN_PANEL_PATH = "data/raw/djia_returns"
+RETURN_PANEL_FIELDS = ("Close", "Volume")
+RETURN_PANEL_DTYPE = "float64"
+
+# -----------------------------
+# DJIA Membership
+# -----------------------------
+# Point-in-time constituents (one row per membership spell with effective dates)
+DJIA_MEMBERSHIP_PATH = "data/reference/djia_membership.csv"
+
+# -----------------------------
+# Portfolio Simulation
+# -----------------------------
+# Monte Carlo weight vectors drawn and scored per block (memory ~ block x tickers x 8 bytes)
+MONTE_CARLO_BLOCK_SIZE = 100_000
@@ -0,0 +1,192 @@
+import os
+import json
+from datetime import date, timedelta
+import pandas as pd
+from config import MASTER_INDEX_PATH, DAILY_INDEX_STATE_PATH, FILING_QUEUE_PATH, CIK_dict
+from filing_storage import decode_bytes, accession_from_filename
+from master_index import parse_master_index, daily_index_path
+
+QUEUE_COLUMNS = ["Ticker", "CIK", "Form Type", "Date Filed", "Filename"]
+
+
+def _quarter(day):
+    return (day.month - 1) // 3 + 1
+
+
+class DailyIndexIngestor:
+    """
+    Incremental EDGAR ingestion from the daily-index master files.
+
+    Only days after the last recorded date are fetched. Their rows are appended to
+    the local master index (the in-progress quarter's daily_{year}_QTR{n}.parquet, read
+    by load_master_index), and the universe's new filings are added to a queue for
+    download and text analysis (process_queue).
+    """
+
+    def __init__(self, path=MASTER_INDEX_PATH, state_path=DAILY_INDEX_STATE_PATH, queue_path=FILING_QUEUE_PATH,
+                 downloader=None, tickers=None, resolver=None, forms=("10-K", "10-Q")):
+        if downloader is None:
+            from edgar_downloader import EdgarDownloader
+            downloader = EdgarDownloader()
+        if resolver is None:
+            from cik_resolver import CIKResolver
+            resolver = CIKResolver(downloader=downloader)
+        self.path = path
+        self.state_path = state_path
+        self.queue_path = queue_path
+        self.downloader = downloader
+        self.forms = forms
+        self.ciks = resolver.resolve_many(list(CIK_dict) if tickers is None else tickers)
+
+    # -----------------------------
+    # State
+    # -----------------------------
+    def last_date(self):
+        """Last day whose daily index has been ingested, or None."""
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path) as f:
+            return date.fromisoformat(json.load(f)["last_date"])
+
+    def _save_state(self, day):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path, "w") as f:
+            json.dump({"last_date": day.isoformat()}, f)
+
+    def pending_dates(self, until=None):
+        """Weekdays after the last ingested date up to until (default today).
+
+        The first run starts at the beginning of until's quarter; earlier quarters
+        come from the quarterly full index.
+        """
+        until = until or date.today()
+        last = self.last_date()
+        day = last + timedelta(days=1) if last else date(until.year, 3 * (_quarter(until) - 1) + 1, 1)
+        days = []
+        while day <= until:
+            if day.weekday() < 5:
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    # -----------------------------
+    # Ingestion
+    # -----------------------------
+    def ingest(self, until=None):
+        """
+        Fetch the daily indexes added since the last run and queue the universe's new filings.
+
+        Days are recorded in order and ingestion stops at the first day that cannot be
+        fetched, so the next run retries it. A 404 for a past day (a holiday) counts
+        as an empty day; today's file may simply not be published yet. Returns the
+        newly queued filings.
+        """
+        today = date.today()
+        days = self.pending_dates(until)
+        urls = [self.downloader.url(f"edgar/daily-index/{d.year}/QTR{_quarter(d)}/master.{d:%Y%m%d}.idx")
+                for d in days]
+
+        frames = []
+        last_ok = None
+        for day, resp in zip(days, self.downloader.get_many(urls)):
+            if resp is not None and resp.status_code == 200:
+                df = parse_master_index(decode_bytes(resp.content))
+                if df is None:
+                    print(f"⚠️ Could not find header in daily index {day}")
+                    break
+                frames.append(df)
+            elif not (resp is not None and resp.status_code == 404 and day < today):
+                break
+            last_ok = day
+
+        if last_ok is None:
+            print("✅ Daily index already up to date")
+            return pd.DataFrame(columns=QUEUE_COLUMNS)
+
+        new_rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if not new_rows.empty:
+            self._append_to_index(new_rows)
+        self._save_state(last_ok)
+        queued = self._queue(new_rows)
+        print(f"✅ Ingested daily indexes through {last_ok}: {len(new_rows)} filings, {len(queued)} queued")
+        return queued
+
+    def _append_to_index(self, rows):
+        """Append rows to each quarter's daily Parquet file, skipping filings already there."""
+        os.makedirs(self.path, exist_ok=True)
+        dates = rows["Date Filed"].dt
+        for (year, quarter), part in rows.groupby([dates.year, (dates.month - 1) // 3 + 1]):
+            daily_path = daily_index_path(year, quarter, self.path)
+            if os.path.exists(daily_path):
+                part = pd.concat([pd.read_parquet(daily_path), part], ignore_index=True)
+            part = part.drop_duplicates(["Filename", "Form Type"], keep="first").reset_index(drop=True)
+            part["Form Type"] = part["Form Type"].astype("category")
+            part.to_parquet(daily_path, index=False)
+
+    def _queue(self, rows):
+        """Add the universe's filings among rows to the queue; return the ones that are new."""
+        if rows.empty:
+            return pd.DataFrame(columns=QUEUE_COLUMNS)
+        tickers_by_cik = {}
+        for ticker, cik in self.ciks.items():
+            tickers_by_cik.setdefault(cik, ticker)
+        rows = rows[rows["CIK"].isin(tickers_by_cik) & rows["Form Type"].isin(self.forms)]
+        rows = rows.assign(Ticker=rows["CIK"].map(tickers_by_cik))[QUEUE_COLUMNS]
+        rows["Form Type"] = rows["Form Type"].astype(str)
+
+        queue = self.queue()
+        new = rows[~rows["Filename"].isin(queue["Filename"])]
+        if not new.empty:
+            self._save_queue(pd.concat([queue, new], ignore_index=True))
+        return new.reset_index(drop=True)
+
+    # -----------------------------
+    # Queue
+    # -----------------------------
+    def queue(self):
+        """Filings waiting for download and analysis."""
+        if os.path.exists(self.queue_path):
+            return pd.read_parquet(self.queue_path)
+        return pd.DataFrame(columns=QUEUE_COLUMNS)
+
+    def _save_queue(self, queue):
+        os.makedirs(os.path.dirname(self.queue_path) or ".", exist_ok=True)
+        queue.to_parquet(self.queue_path, index=False)
+
+    def process_queue(self, corpus=None, analyze=True, **analyze_options):
+        """
+        Download the queued filings into a FilingCorpus and score them with analyze_corpus.
+
+        Filings that reach the corpus leave the queue; failed downloads stay queued for
+        the next run. Returns the metrics of the processed filings (or the downloaded
+        manifest rows when analyze=False).
+        """
+        from filing_corpus import FilingCorpus, analyze_corpus
+
+        queue = self.queue()
+        if queue.empty:
+            print("✅ Filing queue is empty")
+            return pd.DataFrame()
+        if corpus is None:
+            corpus = FilingCorpus()
+
+        url_df = pd.DataFrame({
+            "Ticker": queue["Ticker"],
+            "URL": queue["Filename"].map(self.downloader.url),
+            "CIK": queue["CIK"].astype(int),
+            "Year": pd.to_datetime(queue["Date Filed"]).dt.year,
+            "Form Type": queue["Form Type"],
+            "Date Filed": queue["Date Filed"],
+            "Accession": queue["Filename"].map(accession_from_filename),
+        })
+        corpus.download(url_df, self.downloader)
+
+        done = url_df["Accession"].map(corpus.has).astype(bool)
+        self._save_queue(queue[~done.values].reset_index(drop=True))
+        processed = url_df[done]
+        if processed.empty or not analyze:
+            return processed
+
+        metrics = analyze_corpus(corpus, tickers=processed["Ticker"].unique(), years=processed["Year"].unique(),
+                                 forms=processed["Form Type"].unique(), **analyze_options)
+        return metrics[metrics["Accession"].isin(processed["Accession"])].reset_index(drop=True)
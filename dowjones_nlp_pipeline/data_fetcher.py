@@ -3,32 +3,42 @@ import os
 import json
 from bs4 import BeautifulSoup
 from nltk.sentiment import SentimentIntensityAnalyzer
-import yfinance as yf
 import pandas as pd
-import time
 from datetime import date
-from config import DOW_JONES_URL, START_DATE, END_DATE
+from config import DOW_JONES_URL, START_DATE, END_DATE, RETURN_PANEL_PATH, RETURN_PANEL_FIELDS, RETURN_PANEL_DTYPE
+from price_broker import get_broker
+from return_panel import save_return_panel
+from djia_membership import get_membership
 
 class DataFetcher:
-    def __init__(self):
+    def __init__(self, broker=None):
         self.tickers = []
         self.sentiment = SentimentIntensityAnalyzer()
         self.data = {}
+        self.broker = broker if broker is not None else get_broker()
 
-    def get_dow_jones_tickers(self, url=DOW_JONES_URL):
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        html_data = requests.get(url, headers=headers)
-        soup = BeautifulSoup(html_data.text, 'lxml')
-
-        classes = [f'row-{x}' for x in range(2, 32)]
-        tickers = []
-        for class_name in classes:
-            row = soup.find('tr', class_=class_name)
-            if row:
-                ticker = row.find('td', class_='column-1').text.strip()
-                tickers.append(ticker)
+    def get_dow_jones_tickers(self, url=DOW_JONES_URL, as_of=None, refresh=False):
+        """
+        DJIA constituents on as_of (default today) from the cached membership table.
 
-        self.tickers = sorted(tickers)
+        Nothing is scraped unless refresh=True, which reads the current list from url
+        and records any additions/removals in the table first.
+        """
+        membership = get_membership()
+        if refresh:
+            headers = {'User-Agent': 'Mozilla/5.0'}
+            html_data = requests.get(url, headers=headers)
+            soup = BeautifulSoup(html_data.text, 'lxml')
+
+            # Constituent rows are tr.row-2, tr.row-3, ... (row-1 is the header); the ticker is in td.column-1
+            tickers = [cell.text.strip() for cell in soup.select('tr[class^="row-"]:not(.row-1) td.column-1')]
+            tickers = [t for t in tickers if t]
+            if len(tickers) >= 25:
+                membership.record(tickers)
+            else:
+                print(f"⚠️ Only found {len(tickers)} tickers at {url}; keeping the cached membership table")
+
+        self.tickers = membership.members(as_of, yahoo=True)
         return self
     
     def save_tickers(self, save_dir="data/raw", filename="djia_tickers.json"):
@@ -51,38 +61,36 @@ class DataFetcher:
         if "DOW" in self.tickers:
             self.tickers.remove("DOW")
 
+        # One merged request; only the part of [start, end) not yet in the price store is downloaded
+        self.broker.request(self.tickers, start, end).fetch()
         stock_returns = {}
         for ticker in self.tickers:
-            try:
-                dailyprc = yf.download(
-                    ticker, start, end,
-                    interval="1d", progress=False, threads=False,
-                    auto_adjust=True  # adjusted Close
-                )
-                if dailyprc.empty:
-                    print(f"⚠️ No data for {ticker}, skipping.")
-                    continue
-                dailyrets = dailyprc.pct_change().dropna()
-                stock_returns[ticker] = dailyrets
-                time.sleep(1)  # avoid hammering Yahoo
-            except Exception as e:
-                print(f"❌ Failed to fetch {ticker}: {e}")
+            dailyprc = self.broker.bars(ticker, start, end)
+            if dailyprc.empty:
+                print(f"⚠️ No data for {ticker}, skipping.")
+                continue
+            stock_returns[ticker] = dailyprc.pct_change().dropna()
 
         self.data = stock_returns
         return self
     
-    def save_market_data(self, save_path="data/raw/djia_prices.pkl"):
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    def save_market_data(self, save_path=RETURN_PANEL_PATH, fields=RETURN_PANEL_FIELDS, dtype=RETURN_PANEL_DTYPE):
+        """Save returns as a memory-mappable panel (see return_panel.py); a .pkl path keeps the old pickle."""
         try:
-            pd.to_pickle(self.data, save_path)
-            print(f"✅ Saved market data for {len(self.data)} tickers to {save_path}")
+            if save_path.endswith(".pkl"):
+                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                pd.to_pickle(self.data, save_path)
+                print(f"✅ Saved market data for {len(self.data)} tickers to {save_path}")
+            else:
+                save_return_panel(self.data, save_path, fields, dtype)
         except Exception as e:
             print(f"⚠️ Error saving market data: {e}")
 
     def get_yearly_returns(self, year, drop_tickers_with_no_data=('DOW',)):
         """
         Fetch daily returns and absolute adjusted price changes for all tickers for a given year.
-        Uses auto_adjust=True so 'Close' is adjusted (no 'Adj Close' column needed).
+        Prices come from the shared price broker (auto-adjusted 'Close'), which downloads
+        only the days the local price store does not hold yet.
 
         Returns
         -------
@@ -91,33 +99,23 @@ class DataFetcher:
         start_date = date(year, 1, 1)
         end_date = date(year, 12, 31)
 
+        self.broker.request(self.tickers, start_date, end_date).fetch()
         stock_returns = {}
         for ticker in self.tickers:
-            try:
-                df = yf.download(
-                    ticker,
-                    start=start_date,
-                    end=end_date,
-                    auto_adjust=True,
-                    progress=False
-                )
-
-                if df.empty or 'Close' not in df.columns:
-                    print(f"⚠️ No usable data for {ticker} in {year}")
-                    continue
-
-                out = pd.DataFrame(index=df.index)
-                out['Close'] = df['Close']
-                out['Ret_Close'] = out['Close'].pct_change()
-                out['Ch_Close'] = out['Close'].diff()
-
-                if 'Volume' in df.columns:
-                    out['Volume'] = df['Volume']
-
-                stock_returns[ticker] = out.dropna()
-
-            except Exception as e:
-                print(f"⚠️ Failed to fetch {ticker} for {year}: {e}")
+            df = self.broker.bars(ticker, start_date, end_date)
+            if df.empty or 'Close' not in df.columns:
+                print(f"⚠️ No usable data for {ticker} in {year}")
+                continue
+
+            out = pd.DataFrame(index=df.index)
+            out['Close'] = df['Close']
+            out['Ret_Close'] = out['Close'].pct_change()
+            out['Ch_Close'] = out['Close'].diff()
+
+            if 'Volume' in df.columns:
+                out['Volume'] = df['Volume']
+
+            stock_returns[ticker] = out.dropna()
 
         # Drop problematic tickers
         for bad in drop_tickers_with_no_data:
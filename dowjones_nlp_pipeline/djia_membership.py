@@ -0,0 +1,113 @@
+import os
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+import pandas as pd
+from config import DJIA_MEMBERSHIP_PATH
+
+MEMBERSHIP_COLUMNS = ["Ticker", "Yahoo Ticker", "Start Date", "End Date", "Note"]
+
+
+class DJIAMembership:
+    """
+    Point-in-time DJIA constituents from data/reference/djia_membership.csv.
+
+    Each row is one membership spell: Start Date is the day the change took effect
+    (empty = before the table begins) and End Date the day before the member was
+    replaced (empty = still a member), so spells meet without weekend gaps. Yahoo
+    Ticker is the symbol prices are available under when it differs (e.g. KFT ->
+    MDLZ). The spells are turned once into a sorted list of change dates
+    with the member set in force from each, so members(as_of) is a binary search.
+    """
+
+    def __init__(self, path=DJIA_MEMBERSHIP_PATH):
+        self.path = path
+        if os.path.exists(path):
+            table = pd.read_csv(path, parse_dates=["Start Date", "End Date"], dtype={"Yahoo Ticker": str, "Note": str})
+        else:
+            table = pd.DataFrame(columns=MEMBERSHIP_COLUMNS)
+        self.table = table.reindex(columns=MEMBERSHIP_COLUMNS)
+        self._build()
+
+    def _build(self):
+        table = self.table
+        self._yahoo = {t: (y if isinstance(y, str) and y else t) for t, y in zip(table["Ticker"], table["Yahoo Ticker"])}
+        starts = table["Start Date"].fillna(pd.Timestamp.min)
+        # A spell ending on day D stops counting from D + 1
+        ends = table["End Date"] + pd.Timedelta(days=1)
+        self._dates = sorted({pd.Timestamp.min, *starts, *ends.dropna()})
+        self._members = []
+        for day in self._dates:
+            active = (starts <= day) & (ends.isna() | (day < ends))
+            self._members.append(frozenset(table.loc[active, "Ticker"]))
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def yahoo_ticker(self, ticker):
+        """Symbol to request prices under (a successor's ticker for renamed members)."""
+        return self._yahoo.get(ticker, ticker)
+
+    def members(self, as_of=None, yahoo=False):
+        """Sorted constituents on as_of (default today); yahoo=True maps them to price symbols."""
+        as_of = pd.Timestamp(as_of if as_of is not None else date.today())
+        tickers = self._members[bisect_right(self._dates, as_of) - 1] if self._dates else frozenset()
+        return sorted(self.yahoo_ticker(t) for t in tickers) if yahoo else sorted(tickers)
+
+    def members_between(self, start, end, yahoo=False):
+        """Every ticker that was a constituent at some point in [start, end]."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        lo = max(bisect_right(self._dates, start) - 1, 0)
+        hi = bisect_right(self._dates, end)
+        tickers = set().union(*self._members[lo:hi]) if hi > lo else set()
+        return sorted({self.yahoo_ticker(t) for t in tickers} if yahoo else tickers)
+
+    def changes(self):
+        """Additions and removals as rows of Date, Added, Removed."""
+        rows = []
+        for day, before, after in zip(self._dates[1:], self._members, self._members[1:]):
+            if before != after:
+                rows.append({"Date": day, "Added": sorted(after - before), "Removed": sorted(before - after)})
+        return pd.DataFrame(rows, columns=["Date", "Added", "Removed"])
+
+    # -----------------------------
+    # Updating
+    # -----------------------------
+    def record(self, tickers, effective=None, note="Scraped constituent list"):
+        """
+        Record a current constituent list (e.g. freshly scraped) as of effective (default today).
+
+        Tickers that joined get a spell starting on effective; members missing from
+        the list get an End Date the day before. The table is saved only if something
+        changed. Returns the changes as (added, removed).
+        """
+        effective = pd.Timestamp(effective if effective is not None else date.today()).normalize()
+        current = set(self.members(effective))
+        tickers = set(tickers)
+        added, removed = sorted(tickers - current), sorted(current - tickers)
+        if not added and not removed:
+            return added, removed
+
+        open_spells = self.table["End Date"].isna() | (self.table["End Date"] >= effective)
+        leaving = self.table["Ticker"].isin(removed) & open_spells
+        self.table.loc[leaving, "End Date"] = effective - timedelta(days=1)
+        new_rows = pd.DataFrame({"Ticker": added, "Yahoo Ticker": None, "Start Date": effective, "End Date": pd.NaT,
+                                 "Note": note})
+        self.table = pd.concat([self.table, new_rows], ignore_index=True)
+        self._build()
+        self.save()
+        print(f"✅ DJIA membership updated on {effective.date()}: +{added} -{removed}")
+        return added, removed
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        table = self.table.copy()
+        for col in ("Start Date", "End Date"):
+            table[col] = table[col].dt.strftime("%Y-%m-%d")
+        table.to_csv(self.path, index=False)
+
+
+@lru_cache(maxsize=None)
+def get_membership():
+    """Process-wide membership table, read once."""
+    return DJIAMembership()
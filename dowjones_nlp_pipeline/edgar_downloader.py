@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from filing_storage import write_stream
+from config import (SEC_HEADERS, SEC_ARCHIVES_URL, SEC_MAX_REQUESTS_PER_SECOND, EDGAR_DOWNLOAD_WORKERS,
+                    EDGAR_MAX_RETRIES, EDGAR_DOWNLOAD_MANIFEST)
+
+# Responses worth retrying: throttled by SEC, or a transient server error
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Bytes read from the socket per write when streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate=SEC_MAX_REQUESTS_PER_SECOND, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class EdgarDownloader:
+    """
+    Concurrent EDGAR client sharing one pooled requests.Session.
+
+    Every request, retries included, takes a token from a bucket limited to
+    SEC_MAX_REQUESTS_PER_SECOND, so any number of worker threads stays within SEC's
+    fair-access limit. 429 and 5xx responses and connection errors are retried with
+    exponential backoff (or the server's Retry-After). Completed downloads are appended
+    to a JSON-lines manifest, so an interrupted bulk download resumes where it stopped.
+    base_url can point at a local stand-in server for testing.
+    """
+
+    def __init__(self, base_url=SEC_ARCHIVES_URL, rate=SEC_MAX_REQUESTS_PER_SECOND, workers=EDGAR_DOWNLOAD_WORKERS,
+                 max_retries=EDGAR_MAX_RETRIES, backoff=1.0, headers=SEC_HEADERS, manifest_path=EDGAR_DOWNLOAD_MANIFEST,
+                 timeout=60):
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.manifest_path = manifest_path
+        self.limiter = TokenBucket(rate)
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._manifest_lock = threading.Lock()
+
+    def url(self, path):
+        """Full URL of an Archives path such as edgar/full-index/2020/QTR1/master.idx."""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, url, stream=False):
+        """GET with rate limiting and retries; returns the last response (or raises the last connection error)."""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                resp = self.session.get(url, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+            if resp.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return resp
+            resp.close()
+            retry_after = resp.headers.get("Retry-After", "")
+            time.sleep(float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt)
+        return resp
+
+    def get_many(self, urls):
+        """Fetch several URLs concurrently; responses (None on connection failure) in input order."""
+        def fetch(url):
+            try:
+                return self.get(url)
+            except requests.RequestException as e:
+                print(f"⚠️ Error fetching {url}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(fetch, urls))
+
+    # -----------------------------
+    # Resumable bulk download
+    # -----------------------------
+    def completed(self):
+        """{url: path} of manifest entries whose file is still on disk and was not overwritten since."""
+        latest = {}
+        if self.manifest_path and os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                for line in f:
+                    entry = json.loads(line)
+                    latest[entry["path"]] = entry["url"]
+        return {url: path for path, url in latest.items() if os.path.exists(path)}
+
+    def _record(self, url, path, n_bytes):
+        if not self.manifest_path:
+            return
+        with self._manifest_lock:
+            os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+            with open(self.manifest_path, "a") as f:
+                f.write(json.dumps({"url": url, "path": path, "bytes": n_bytes}) + "\n")
+
+    def download(self, url, path):
+        """
+        Stream one URL to path in chunks; True on success.
+
+        The response is never held in memory as a whole. Paths ending in .gz are
+        gzip-compressed as they are written (see filing_storage.write_stream).
+        """
+        try:
+            resp = self.get(url, stream=True)
+            if resp.status_code != 200:
+                print(f"❌ Failed to download {url} — HTTP {resp.status_code}")
+                resp.close()
+                return False
+            with resp:
+                n_bytes = write_stream(resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE), path)
+        except requests.RequestException as e:
+            print(f"⚠️ Error downloading {url}: {e}")
+            return False
+        self._record(url, path, n_bytes)
+        return True
+
+    def download_many(self, jobs, resume=True):
+        """
+        Download (url, path) jobs concurrently.
+
+        With resume=True, jobs already recorded in the manifest with their file present
+        are skipped. Returns {url: True/False}, skipped jobs counting as True.
+        """
+        jobs = list(jobs)
+        done = self.completed() if resume else {}
+        todo = [(url, path) for url, path in jobs if done.get(url) != path]
+        if len(todo) < len(jobs):
+            print(f"♻️ {len(jobs) - len(todo)} of {len(jobs)} downloads already complete")
+        results = {url: True for url, _ in jobs}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for (url, _), ok in zip(todo, pool.map(lambda job: self.download(*job), todo)):
+                results[url] = ok
+        return results
@@ -0,0 +1,141 @@
+import re
+from itertools import chain
+
+# Markers that identify a full EDGAR .txt submission (as opposed to a bare document)
+SUBMISSION_MARKERS = ("<SEC-DOCUMENT>", "<SEC-HEADER>", "<IMS-DOCUMENT>", "<DOCUMENT>")
+
+# Encoded payloads that can appear inside a document's <TEXT> block. <XBRL> and <XML>
+# are not among them: an inline-XBRL 10-K (2019 onward) wraps its whole HTML body in
+# <XBRL>...</XBRL>, so their contents are read as text.
+UUENCODE_BEGIN_RE = re.compile(r'^begin [0-7]{3,4} \S')
+BINARY_BLOCK_TAGS = ("<PDF>", "<ZIP>")
+
+# Line starts shorter than this are completed before markers are matched against them
+MIN_LINE_START = 64
+
+
+def iter_documents(f, max_piece=1 << 20):
+    """
+    Split an EDGAR submission on its <DOCUMENT> blocks.
+
+    Yields (header, body_pieces) per document, where header holds the <TYPE>,
+    <SEQUENCE>, <FILENAME> and <DESCRIPTION> values and body_pieces is an iterator
+    over the <TEXT> contents with uuencoded and binary payloads removed. The file is
+    read with readline(max_piece), so very long lines never have to fit in memory.
+    Each body must be consumed (or abandoned) before moving to the next document.
+    """
+    return _iter_documents(_iter_pieces(f, max_piece))
+
+
+def _iter_documents(pieces):
+    for piece, at_line_start in pieces:
+        if at_line_start and piece.startswith("<DOCUMENT>"):
+            header = _read_document_header(pieces)
+            yield header, _iter_body(pieces)
+
+
+def _iter_pieces(f, max_piece):
+    """Yield (piece, at_line_start) from f, reading at most max_piece characters at a time."""
+    at_line_start = True
+    while True:
+        piece = f.readline(max_piece)
+        if not piece:
+            return
+        # Make sure a line start is long enough to recognise a marker such as <DOCUMENT>
+        while at_line_start and len(piece) < MIN_LINE_START and not piece.endswith("\n"):
+            more = f.readline(MIN_LINE_START - len(piece))
+            if not more:
+                break
+            piece += more
+        yield piece, at_line_start
+        at_line_start = piece.endswith("\n")
+
+
+def _read_document_header(pieces):
+    """Consume a document's header lines up to <TEXT>; return them as a dict."""
+    header = {}
+    for piece, at_line_start in pieces:
+        if not at_line_start:
+            continue
+        line = piece.strip()
+        if line.startswith("<TEXT>"):
+            break
+        m = re.match(r'<([A-Z-]+)>(.*)', line)
+        if m:
+            header[m.group(1)] = m.group(2).strip()
+    return header
+
+
+def _iter_body(pieces):
+    """Yield a document's <TEXT> contents, dropping uuencoded and binary blocks."""
+    skip_until = None
+    for piece, at_line_start in pieces:
+        if at_line_start:
+            line = piece.rstrip("\r\n")
+            if line.startswith("</TEXT>") or line.startswith("</DOCUMENT>"):
+                return
+            if skip_until is not None:
+                if line.strip() == skip_until:
+                    skip_until = None
+                continue
+            if UUENCODE_BEGIN_RE.match(line):
+                skip_until = "end"
+                continue
+            tag = line.strip()
+            if tag in BINARY_BLOCK_TAGS:
+                skip_until = "</" + tag[1:]
+                continue
+        elif skip_until is not None:
+            continue
+        yield piece
+
+
+def iter_primary_document(f, form_types=None, max_piece=1 << 20):
+    """
+    Yield the text of a submission's primary document, piece by piece.
+
+    The primary document is the first <DOCUMENT> whose <TYPE> is in form_types, or
+    simply the first document when form_types is None (EDGAR always lists the main
+    form first). Reading stops at its </TEXT>, so exhibits, XBRL instances and
+    encoded attachments are never read. Input that is not a full submission is
+    passed through unchanged.
+    """
+    pieces = _iter_pieces(f, max_piece)
+    first = next(pieces, None)
+    if first is None:
+        return
+    pieces = chain([first], pieces)
+    if not first[0].lstrip().startswith(SUBMISSION_MARKERS):
+        for piece, _ in pieces:
+            yield piece
+        return
+
+    for header, body in _iter_documents(pieces):
+        if form_types is None or header.get("TYPE", "").upper() in form_types:
+            yield from body
+            return
+
+
+class PrimaryDocumentReader:
+    """File-like read(size) over iter_primary_document, for chunked consumers."""
+
+    def __init__(self, f, form_types=None, max_piece=1 << 20):
+        self._pieces = iter_primary_document(f, form_types, max_piece)
+        self._buffer = ""
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._buffer + "".join(self._pieces)
+            self._buffer = ""
+            return data
+        parts = [self._buffer]
+        n = len(self._buffer)
+        while n < size:
+            piece = next(self._pieces, None)
+            if piece is None:
+                break
+            parts.append(piece)
+            n += len(piece)
+        data = "".join(parts)
+        self._buffer = data[size:]
+        return data[:size]
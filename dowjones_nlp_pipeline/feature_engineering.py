@@ -2,9 +2,9 @@
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import date
 from data_fetcher import DataFetcher  # dynamically fetches DJIA tickers
+from price_broker import get_broker
 
 def engineer_features_from_df(df, ticker):
     """Run technical feature engineering on a single ticker DataFrame."""
@@ -42,37 +42,29 @@ def engineer_features_from_df(df, ticker):
 
     return df.add_prefix(f"{ticker}_")
 
-def get_features_with_partner(base_ticker, start_date, end_date, auto_adjust=False):
+def get_features_with_partner(base_ticker, start_date, end_date, auto_adjust=False, broker=None):
     """Finds the most correlated Dow Jones ticker to base_ticker and engineers features for both."""
     np.random.seed(1)
 
-    # Get DJIA tickers
-    fetcher = DataFetcher().get_dow_jones_tickers()
+    # DJIA constituents at the start of the window (cached membership table, no scraping)
+    fetcher = DataFetcher().get_dow_jones_tickers(as_of=start_date)
     dj_tickers = fetcher.tickers
     if "DOW" in dj_tickers:
         dj_tickers.remove("DOW")
     if base_ticker not in dj_tickers:
         dj_tickers.append(base_ticker)
 
-    # Bulk download with MultiIndex intact
-    all_data = yf.download(
-        dj_tickers,
-        start=start_date,
-        end=end_date,
-        auto_adjust=auto_adjust,
-        group_by='ticker'
-    )
+    # One batched request through the shared price broker
+    broker = broker if broker is not None else get_broker()
+    broker.request(dj_tickers, start_date, end_date, adjusted=auto_adjust).fetch()
+    all_data = {t: broker.bars(t, start_date, end_date, adjusted=auto_adjust) for t in dj_tickers}
 
     # Build returns DataFrame for correlation
     returns = {}
-    for t in dj_tickers:
-        try:
-            field = "Close" if auto_adjust else "Adj Close"
-            series = all_data[t][field].pct_change()
-            if isinstance(series, pd.Series):
-                returns[t] = series
-        except KeyError:
-            pass
+    field = "Close" if auto_adjust else "Adj Close"
+    for t, bars in all_data.items():
+        if field in bars.columns:
+            returns[t] = bars[field].pct_change()
 
     returns = {k: v for k, v in returns.items() if not v.dropna().empty}
     returns_df = pd.DataFrame(returns).dropna()
@@ -85,7 +77,7 @@ def get_features_with_partner(base_ticker, start_date, end_date, auto_adjust=Fal
     correlations = returns_df.corr()[base_ticker].drop(base_ticker)
     most_corr_ticker = correlations.idxmax()
 
-    # Slice clean single-ticker DataFrames from MultiIndex
+    # Single-ticker DataFrames
     base_df = all_data[base_ticker].copy()
     partner_df = all_data[most_corr_ticker].copy()
 
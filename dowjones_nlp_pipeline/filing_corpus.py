@@ -0,0 +1,164 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from config import SEC_CORPUS_PATH, CORPUS_METRICS_PATH, TEXT_METRICS_CHUNK_SIZE, TEXT_METRICS_TOKENIZER
+from filing_storage import filing_file_name
+from cik_resolver import get_resolver
+from text_metrics import METRICS_VERSION, lexicon_fingerprint, score_filing, _score_filings
+from lm_lexicon import check_categories
+from utils.syllable_table import load_syllable_table
+
+MANIFEST_COLUMNS = ["Ticker", "CIK", "Year", "Form Type", "Date Filed", "Accession", "Path"]
+METRIC_COLUMNS = ["Uncertainty", "Tone", "FOG", "Readability"]
+
+
+class FilingCorpus:
+    """
+    Downloaded SEC filings addressed by (ticker, year, form type, accession).
+
+    Each filing is stored once as {ticker}/{year}/{form}_{accession}.txt.gz under path,
+    so filings of different years and forms never overwrite each other. manifest.parquet
+    lists every stored filing.
+    """
+
+    def __init__(self, path=SEC_CORPUS_PATH):
+        self.path = path
+        self.manifest_path = os.path.join(path, "manifest.parquet")
+        if os.path.exists(self.manifest_path):
+            self.manifest = pd.read_parquet(self.manifest_path)
+        else:
+            self.manifest = pd.DataFrame(columns=MANIFEST_COLUMNS)
+        self._accessions = set(self.manifest["Accession"])
+        self._pending = []
+
+    def filing_path(self, ticker, year, form_type, accession):
+        """Where a filing is stored; "10-K/A" is written as "10-KA". The folder is created on write."""
+        return os.path.join(self.path, ticker, str(year), f"{form_type.replace('/', '')}_{filing_file_name(accession)}")
+
+    def has(self, accession):
+        return accession in self._accessions
+
+    def register(self, row, path):
+        """Record a stored filing; row carries the manifest columns (see SECDataFetcher.build_url_df)."""
+        self._pending.append({**{col: row[col] for col in MANIFEST_COLUMNS[:-1]}, "Path": path})
+        self._accessions.add(row["Accession"])
+
+    def download(self, url_df, downloader):
+        """
+        Download the filings of a URL DataFrame (see SECDataFetcher.build_url_df) not stored yet.
+
+        Filings are fetched concurrently with downloader (an EdgarDownloader) within SEC's
+        rate limit, streamed to their corpus path and registered, and the manifest is
+        saved. Returns the rows that were downloaded.
+        """
+        url_df = url_df[~url_df["Accession"].map(self.has).astype(bool)]
+        paths = [self.filing_path(row["Ticker"], row["Year"], row["Form Type"], row["Accession"])
+                 for _, row in url_df.iterrows()]
+        results = downloader.download_many(zip(url_df["URL"], paths))
+        saved = []
+        for (i, row), save_path in zip(url_df.iterrows(), paths):
+            if not results.get(row["URL"]):
+                print(f"❌ Failed to download {row['Ticker']}")
+                continue
+            self.register(row, save_path)
+            saved.append(i)
+            print(f"✅ Saved {row['Ticker']} {row['Form Type']}")
+        self.save()
+        return url_df.loc[saved]
+
+    def save(self):
+        """Write newly registered filings to the manifest."""
+        if not self._pending:
+            return self
+        manifest = pd.concat([self.manifest, pd.DataFrame(self._pending, columns=MANIFEST_COLUMNS)],
+                             ignore_index=True)
+        manifest["Year"] = manifest["Year"].astype(int)
+        self.manifest = manifest.drop_duplicates("Accession", keep="last").reset_index(drop=True)
+        os.makedirs(self.path, exist_ok=True)
+        self.manifest.to_parquet(self.manifest_path, index=False)
+        print(f"✅ Corpus manifest: {len(self.manifest)} filings ({len(self._pending)} new)")
+        self._pending = []
+        return self
+
+    def fetch(self, years, forms=("10-K",), all_filings=True):
+        """Download every Dow Jones filing of the given years and forms that is not stored yet."""
+        from sec_data_fetcher import SECDataFetcher
+
+        for year in years:
+            sec_fetcher = SECDataFetcher(year).get_master_index(form_type=forms).filter_to_dow_jones()
+            if sec_fetcher.data.empty:
+                continue
+            url_df = sec_fetcher.build_url_df(all_filings=all_filings)
+            self.download(url_df, sec_fetcher.downloader)
+        return self
+
+    def select(self, tickers=None, years=None, forms=None):
+        """Manifest rows for a slice of the corpus, e.g. select(years=range(2010, 2025), forms=("10-K", "10-Q"))."""
+        df = self.manifest
+        if tickers is not None:
+            # Match on CIK as well, resolved as of each filing year's end, so a renamed
+            # company's older filings are included and a reused ticker's are not
+            resolver = get_resolver()
+            ciks = {(resolver.resolve(t, as_of=f"{year}-12-31"), int(year))
+                    for t in tickers for year in (years if years is not None else df["Year"].unique())}
+            held = [(int(cik), int(year)) in ciks for cik, year in zip(df["CIK"], df["Year"])]
+            df = df[df["Ticker"].isin(list(tickers)) | pd.Series(held, index=df.index, dtype=bool)]
+        if years is not None:
+            df = df[df["Year"].isin(list(years))]
+        if forms is not None:
+            df = df[df["Form Type"].isin([forms] if isinstance(forms, str) else list(forms))]
+        return df[df["Path"].map(os.path.exists).astype(bool)].sort_values(["Ticker", "Year", "Date Filed"]).reset_index(drop=True)
+
+
+def _score_corpus_filing(entry, resources, **options):
+    """score_filing for one (accession, ticker, path) corpus entry."""
+    accession, ticker, path = entry
+    row = score_filing(ticker, resources, filing_path=path, **options)
+    return None if row is None else {"Accession": accession, **row}
+
+
+def analyze_corpus(corpus=None, tickers=None, years=None, forms=("10-K",), pronouncing_dict=None, workers=1,
+                   stream=False, chunk_size=TEXT_METRICS_CHUNK_SIZE, primary_only=True,
+                   tokenizer=TEXT_METRICS_TOKENIZER, categories=(), panel_path=CORPUS_METRICS_PATH):
+    """
+    Uncertainty, Tone, FOG and Flesch for any slice of a FilingCorpus.
+
+    Results live in a columnar panel (panel_path) keyed by accession and scoring
+    options: each filing is scored once, and later slices that overlap it are served
+    from the panel. Options are as in analyze_filings. Returns one row per filing
+    with Ticker, CIK, Year, Form Type, Date Filed, Accession and the metrics.
+    """
+    if corpus is None:
+        corpus = FilingCorpus()
+    categories = tuple(c for c in categories if c != "Uncertainty")
+    check_categories(categories)
+    options = {"stream": stream, "chunk_size": chunk_size, "primary_only": primary_only, "tokenizer": tokenizer,
+               "categories": categories}
+    fingerprint = hashlib.sha256(json.dumps(
+        {"version": METRICS_VERSION, "lexicons": lexicon_fingerprint(), "stream": stream,
+         "chunk_size": chunk_size if stream else None, "primary_only": primary_only, "tokenizer": tokenizer,
+         "categories": sorted(categories)},
+        sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    filings = corpus.select(tickers, years, forms)
+    panel = pd.read_parquet(panel_path) if os.path.exists(panel_path) else pd.DataFrame(columns=["Accession", "Fingerprint"])
+    done = set(panel.loc[panel["Fingerprint"] == fingerprint, "Accession"])
+    todo = filings[~filings["Accession"].isin(done)]
+    print(f"♻️ {len(filings) - len(todo)} of {len(filings)} filings served from the metrics panel")
+
+    if not todo.empty:
+        if pronouncing_dict is None:
+            pronouncing_dict = load_syllable_table()
+        entries = list(zip(todo["Accession"], todo["Ticker"], todo["Path"]))
+        rows = [r for r in _score_filings(entries, pronouncing_dict, workers, options, score_fn=_score_corpus_filing) if r]
+        if rows:
+            scored = pd.DataFrame(rows).drop(columns="Ticker")
+            scored["Fingerprint"] = fingerprint
+            panel = pd.concat([panel, scored], ignore_index=True)
+            panel = panel.drop_duplicates(["Accession", "Fingerprint"], keep="last").reset_index(drop=True)
+            os.makedirs(os.path.dirname(panel_path) or ".", exist_ok=True)
+            panel.to_parquet(panel_path, index=False)
+
+    metrics = panel.loc[panel["Fingerprint"] == fingerprint].reindex(columns=["Accession", *METRIC_COLUMNS, *categories])
+    return filings[MANIFEST_COLUMNS[:-1]].merge(metrics, on="Accession").reset_index(drop=True)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# Annual report forms; amendments are the same form with "/A"
+TEN_K_FORMS = ("10-K", "10-K405")
+
+# Fiscal year of a filing = year of (Date Filed - FISCAL_YEAR_LAG_DAYS): annual reports are
+# filed 2-3 months after the fiscal year ends (a Feb 2021 10-K and an Oct 2020 10-K for a
+# September year-end both map to fiscal 2020)
+FISCAL_YEAR_LAG_DAYS = 90
+
+POLICIES = ("all", "first", "latest", "latest_per_year")
+
+
+def amended(forms):
+    """forms plus their "/A" amendments."""
+    forms = tuple(forms)
+    return forms + tuple(f"{form}/A" for form in forms if not form.endswith("/A"))
+
+
+def fiscal_year(dates):
+    """Approximate fiscal year of filings from their filing dates (see FISCAL_YEAR_LAG_DAYS)."""
+    return (pd.DatetimeIndex(pd.to_datetime(dates)) - pd.Timedelta(days=FISCAL_YEAR_LAG_DAYS)).year
+
+
+class FilingIndex:
+    """
+    Master-index rows grouped by CIK and sorted by filing date.
+
+    The index is sorted once; each CIK then maps to a contiguous block of rows, so a
+    lookup is a dict access plus a binary search on the dates instead of a boolean
+    mask over the whole index.
+    """
+
+    def __init__(self, index_df):
+        df = index_df.assign(**{"CIK": index_df["CIK"].astype("int64"),
+                                "Date Filed": pd.to_datetime(index_df["Date Filed"])})
+        self.data = df.sort_values(["CIK", "Date Filed"], kind="stable").reset_index(drop=True)
+        self._dates = self.data["Date Filed"].to_numpy()
+        self._forms = self.data["Form Type"].astype(str).to_numpy()
+
+        ciks = self.data["CIK"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, ciks[1:] != ciks[:-1]]) if len(ciks) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(ciks)]
+        self._blocks = {int(ciks[s]): (int(s), int(e)) for s, e in zip(starts, ends)}
+
+    def __contains__(self, cik):
+        return int(cik) in self._blocks
+
+    def filings(self, cik, forms=TEN_K_FORMS, start=None, end=None, include_amendments=False, policy="all"):
+        """
+        Filings of one CIK, oldest first.
+
+        forms restricts the form types (None keeps every form in the index), with
+        include_amendments adding their "/A" versions. start/end bound the filing date
+        (inclusive). policy is "all", "first" (earliest filing), "latest", or
+        "latest_per_year" (the last filing per fiscal year, so an amendment replaces
+        the original when amendments are included).
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {POLICIES}")
+        lo, hi = self._blocks.get(int(cik), (0, 0))
+        if start is not None:
+            lo += int(np.searchsorted(self._dates[lo:hi], np.datetime64(pd.Timestamp(start)), side="left"))
+        if end is not None:
+            hi = lo + int(np.searchsorted(self._dates[lo:hi], np.datetime64(pd.Timestamp(end)), side="right"))
+
+        rows = self.data.iloc[lo:hi]
+        if forms is not None:
+            wanted = amended(forms) if include_amendments else tuple(forms)
+            rows = rows[np.isin(self._forms[lo:hi], wanted)]
+
+        if policy == "first":
+            return rows.iloc[:1]
+        if policy == "latest":
+            return rows.iloc[-1:]
+        if policy == "latest_per_year":
+            return rows[~fiscal_year(rows["Date Filed"]).duplicated(keep="last")]
+        return rows
+
+    def lookup(self, ciks, **options):
+        """filings() for several CIKs, concatenated in CIK order (options as in filings)."""
+        frames = [self.filings(cik, **options) for cik in ciks]
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames, ignore_index=True) if frames else self.data.iloc[0:0]
@@ -0,0 +1,101 @@
+import re
+
+# 10-K Item number -> section name
+ITEM_NAMES = {
+    "1": "Business",
+    "1A": "Risk Factors",
+    "1B": "Unresolved Staff Comments",
+    "1C": "Cybersecurity",
+    "2": "Properties",
+    "3": "Legal Proceedings",
+    "4": "Mine Safety Disclosures",
+    "5": "Market for Registrant's Common Equity",
+    "6": "Selected Financial Data",
+    "7": "MD&A",
+    "7A": "Quantitative and Qualitative Disclosures About Market Risk",
+    "8": "Financial Statements and Supplementary Data",
+    "9": "Changes in and Disagreements with Accountants",
+    "9A": "Controls and Procedures",
+    "9B": "Other Information",
+    "9C": "Disclosure Regarding Foreign Jurisdictions that Prevent Inspections",
+    "10": "Directors, Executive Officers and Corporate Governance",
+    "11": "Executive Compensation",
+    "12": "Security Ownership",
+    "13": "Certain Relationships and Related Transactions",
+    "14": "Principal Accountant Fees and Services",
+    "15": "Exhibits and Financial Statement Schedules",
+    "16": "Form 10-K Summary",
+}
+
+# "item 1a", "item&nbsp;7." ... on lowercase, tag-stripped text. Longer numbers first so
+# "1a" and "10" are not cut short to "1".
+ITEM_RE = re.compile(
+    r'(?<!\w)item(?:\s|&nbsp;|&#160;|&#xa0;)*'
+    r'(1a|1b|1c|7a|9a|9b|9c|10|11|12|13|14|15|16|1|2|3|4|5|6|7|8|9)\b'
+)
+
+# Words that mark a match as a cross-reference ("see item 7") rather than a heading. Only
+# same-line, non-terminal punctuation may sit in between: a paragraph ending "... to." is
+# followed by a heading, not a reference
+CROSS_REFERENCE_RE = re.compile(r'\b(?:see|in|under|and|of|to|within|per)(?:[ \t,("\']|&nbsp;|&#160;|&#xa0;)*$')
+
+# A heading starts the text, a line, or a block (a stripped tag leaves a run of spaces),
+# or directly follows a PART heading ("part ii item 5"); "part ii, item 8 of" does not
+HEADING_START_RE = re.compile(r'(?:\A|\n|\s\s|\bpart\s+[ivx]+[\s.:\-\u2013\u2014]*)(?:\s|&nbsp;|&#160;|&#xa0;)*$')
+
+# Items in the order they appear in a 10-K
+ITEM_ORDER = {item: rank for rank, item in enumerate(ITEM_NAMES)}
+
+
+def find_item_spans(clean_text):
+    """
+    Locate 10-K Item sections in lowercase, tag-stripped text.
+
+    Returns {item: (start, end)} in document order. Headings are found in a single
+    regex pass; a match counts only where a heading can start (see HEADING_START_RE)
+    and not after a cross-reference word. Each Item usually still matches several
+    times (table of contents, the real heading); of the sequences of matches in
+    10-K Item order, the one followed by the most text before the next match is
+    taken as the headings.
+    """
+    matches = []
+    for m in ITEM_RE.finditer(clean_text):
+        before = clean_text[max(0, m.start() - 40):m.start()]
+        if CROSS_REFERENCE_RE.search(before[-24:]) or not HEADING_START_RE.search(before):
+            continue
+        matches.append((m.group(1).upper(), m.start()))
+
+    # Heaviest increasing sequence: chains[i] = (text covered, previous match) of the best
+    # ordered sequence ending at match i; best[rank] = the match of that rank ending the best one
+    chains = []
+    best = {}
+    for i, (item, start) in enumerate(matches):
+        end = matches[i + 1][1] if i + 1 < len(matches) else len(clean_text)
+        rank = ITEM_ORDER[item]
+        prev = max((j for r, j in best.items() if r < rank), key=lambda j: chains[j][0], default=None)
+        chains.append((end - start + (chains[prev][0] if prev is not None else 0), prev))
+        if rank not in best or chains[i][0] > chains[best[rank]][0]:
+            best[rank] = i
+
+    heads = []
+    i = max(best.values(), key=lambda j: chains[j][0], default=None)
+    while i is not None:
+        heads.append((matches[i][1], matches[i][0]))
+        i = chains[i][1]
+    heads.reverse()
+
+    # Sections run from their heading to the next chosen heading
+    spans = {}
+    for i, (start, item) in enumerate(heads):
+        end = heads[i + 1][0] if i + 1 < len(heads) else len(clean_text)
+        spans[item] = (start, end)
+    return spans
+
+
+def normalize_items(sections):
+    """Upper-case Item keys ("1a" -> "1A") and reject unknown ones."""
+    items = [str(s).upper().replace("ITEM", "").strip() for s in sections]
+    unknown = [s for s in items if s not in ITEM_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown 10-K items: {unknown}")
+    return items
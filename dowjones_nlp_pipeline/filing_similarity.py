@@ -0,0 +1,165 @@
+import os
+import zlib
+import numpy as np
+import pandas as pd
+from collections import Counter
+from scipy import sparse
+from config import SIMILARITY_PATH, SIMILARITY_N_FEATURES, MINHASH_PERMUTATIONS, TEXT_METRICS_TOKENIZER
+from metrics_cache import file_sha256
+from text_metrics import filing_tokens
+
+# MinHash permutations h(x) = ((a*x + b) mod p) & 0xFFFFFFFF with p the Mersenne prime 2^61 - 1;
+# a*x is allowed to wrap around in uint64, as in the usual vectorised MinHash
+MINHASH_PRIME = np.uint64((1 << 61) - 1)
+MINHASH_MAX = np.uint64((1 << 32) - 1)
+
+
+def _minhash_params(num_perm, seed=1):
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def token_hashes(words):
+    """Stable 32-bit hashes (crc32) for a sequence of words, independent of PYTHONHASHSEED."""
+    return np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+
+
+def filing_signature(tokens, n_features=SIMILARITY_N_FEATURES, num_perm=MINHASH_PERMUTATIONS):
+    """
+    Hash one filing's tokens into a sparse term-count vector and a MinHash signature.
+
+    Returns (indices, counts, minhash): the nonzero hashed feature indices (sorted),
+    their term counts, and num_perm MinHash values over the set of distinct words.
+    """
+    freq = Counter(t for t in tokens if t.isalpha())
+    words = list(freq)
+    hashes = token_hashes(words)
+    counts = np.fromiter(freq.values(), dtype=np.float64, count=len(words))
+
+    # Collisions in the hashed space just add their counts together
+    indices, inverse = np.unique(hashes % n_features, return_inverse=True)
+    summed = np.bincount(inverse, weights=counts, minlength=len(indices))
+
+    if len(hashes):
+        a, b = _minhash_params(num_perm)
+        minhash = (((a[:, None] * hashes[None, :] + b[:, None]) % MINHASH_PRIME) & MINHASH_MAX).min(axis=1)
+    else:
+        minhash = np.full(num_perm, MINHASH_MAX, dtype=np.uint64)
+    return indices.astype(np.int64), summed, minhash
+
+
+class SignatureStore:
+    """
+    On-disk store of per-filing signatures, one .npz per accession number.
+
+    A stored signature is reused while the source file's SHA-256 and the hashing
+    parameters are unchanged, so adding a year only hashes the new filings.
+    """
+
+    def __init__(self, path=SIMILARITY_PATH, n_features=SIMILARITY_N_FEATURES, num_perm=MINHASH_PERMUTATIONS):
+        self.path = path
+        self.n_features = n_features
+        self.num_perm = num_perm
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, accession):
+        return os.path.join(self.path, f"{accession}.npz")
+
+    def load(self, accession, content_sha256=None):
+        """Stored (indices, counts, minhash) for a filing, or None if missing or stale."""
+        path = self._file(accession)
+        if not os.path.exists(path):
+            return None
+        # Copy the arrays out so the file handle is closed before they are returned
+        with np.load(path) as data:
+            if (int(data["n_features"]) != self.n_features or len(data["minhash"]) != self.num_perm
+                    or (content_sha256 is not None and str(data["sha256"]) != content_sha256)):
+                return None
+            return data["indices"].copy(), data["counts"].copy(), data["minhash"].copy()
+
+    def save(self, accession, signature, content_sha256):
+        indices, counts, minhash = signature
+        np.savez(self._file(accession), indices=indices, counts=counts, minhash=minhash,
+                 n_features=self.n_features, sha256=content_sha256)
+
+    def get_or_build(self, filing_path, accession=None, primary_only=True, tokenizer=TEXT_METRICS_TOKENIZER):
+        """Signature for a filing, hashing it only if it is new or its contents changed.
+
+        accession defaults to the file name, which is the accession number for stored filings.
+        """
+        if accession is None:
+            accession = os.path.basename(filing_path).split(".")[0]
+        content = file_sha256(filing_path)
+        signature = self.load(accession, content)
+        if signature is None:
+            tokens = filing_tokens(filing_path, primary_only=primary_only, tokenizer=tokenizer)
+            signature = filing_signature(tokens, self.n_features, self.num_perm)
+            self.save(accession, signature, content)
+            print(f"🔑 Hashed {accession}")
+        return signature
+
+
+def yoy_similarity(filings, store=None, primary_only=True, tokenizer=TEXT_METRICS_TOKENIZER):
+    """
+    Year-over-year filing similarity per ticker ("lazy prices").
+
+    filings is a DataFrame with Ticker, Year and Path columns, plus optional Form Type
+    (default "10-K"), Accession and Date Filed (as in a FilingCorpus manifest). Each
+    filing is turned into a hashed term vector and a MinHash signature (cached in
+    store), the vectors are stacked into one sparse matrix, and every filing is
+    compared in batch with the filing of the same ticker and form type from the
+    previous fiscal year (the n-th of that year, so 10-Qs pair quarter by quarter).
+    Returns Ticker, Form Type, Year, Prev Year, Cosine and Jaccard (MinHash estimate
+    of the distinct-word Jaccard index).
+    """
+    if store is None:
+        store = SignatureStore()
+
+    cols = ["Ticker", "Form Type", "Year", "Prev Year", "Cosine", "Jaccard"]
+    filings = filings[filings["Path"].map(os.path.exists)]
+    if "Form Type" not in filings.columns:
+        filings = filings.assign(**{"Form Type": "10-K"})
+    if "Accession" not in filings.columns:
+        filings = filings.assign(Accession=None)
+    order = ["Ticker", "Form Type", "Year", *(["Date Filed"] if "Date Filed" in filings.columns else [])]
+    filings = filings.sort_values(order, kind="stable").reset_index(drop=True)
+    if filings.empty:
+        return pd.DataFrame(columns=cols)
+
+    signatures = [
+        store.get_or_build(row["Path"], row["Accession"], primary_only=primary_only, tokenizer=tokenizer)
+        for row in filings.to_dict("records")
+    ]
+
+    # One CSR row per filing, L2-normalised so a row-wise dot product is the cosine
+    indptr = np.cumsum([0] + [len(sig[0]) for sig in signatures])
+    X = sparse.csr_matrix(
+        (np.concatenate([sig[1] for sig in signatures]), np.concatenate([sig[0] for sig in signatures]), indptr),
+        shape=(len(signatures), store.n_features),
+    )
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    X = sparse.diags(1.0 / norms) @ X
+    minhash = np.vstack([sig[2] for sig in signatures])
+
+    # Pair the n-th filing of (ticker, form, year) with the n-th of the year before
+    keys = filings[["Ticker", "Form Type", "Year"]].assign(
+        Seq=filings.groupby(["Ticker", "Form Type", "Year"]).cumcount(), Row=np.arange(len(filings)))
+    pairs = keys.merge(keys.assign(Year=keys["Year"] + 1), on=["Ticker", "Form Type", "Year", "Seq"],
+                       suffixes=("", " Prev")).sort_values("Row")
+    curr = pairs["Row"].to_numpy()
+    prev = pairs["Row Prev"].to_numpy()
+
+    cosine = np.asarray(X[prev].multiply(X[curr]).sum(axis=1)).ravel()
+    jaccard = (minhash[prev] == minhash[curr]).mean(axis=1)
+
+    return pd.DataFrame({
+        "Ticker": filings["Ticker"].values[curr],
+        "Form Type": filings["Form Type"].values[curr],
+        "Year": filings["Year"].values[curr],
+        "Prev Year": filings["Year"].values[prev],
+        "Cosine": cosine,
+        "Jaccard": jaccard,
+    }, columns=cols)
@@ -0,0 +1,99 @@
+import os
+import gzip
+import json
+import codecs
+from config import SEC_FILINGS_PATH, FILING_COMPRESSION, FILING_COMPRESSLEVEL
+
+# Bytes that are not valid UTF-8 are decoded as Latin-1 instead of failing. Applied per
+# invalid byte sequence, so it works the same on a whole file and on streamed chunks.
+DECODE_ERRORS = "utf8-latin1-fallback"
+
+
+def _latin1_fallback(error):
+    return error.object[error.start:error.end].decode("latin-1"), error.end
+
+
+codecs.register_error(DECODE_ERRORS, _latin1_fallback)
+
+# Which downloaded filing each ticker's analysis reads, by file name in SEC_FILINGS_PATH
+LATEST_FILINGS_FILE = "latest_10K.json"
+
+
+def decode_bytes(data):
+    """Decode SEC content as UTF-8, falling back to Latin-1 for invalid bytes."""
+    return data.decode("utf-8", errors=DECODE_ERRORS)
+
+
+def open_filing(path):
+    """Open a stored filing for text reading, decompressing .gz files transparently."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors=DECODE_ERRORS)
+    return open(path, encoding="utf-8", errors=DECODE_ERRORS)
+
+
+def filing_file_name(accession, compress=FILING_COMPRESSION):
+    """File name a filing is stored under: its accession number, gzip-compressed by default."""
+    return f"{accession}.txt.gz" if compress else f"{accession}.txt"
+
+
+def accession_from_filename(filename):
+    """Accession number of a master-index Filename (edgar/data/<cik>/<accession>.txt)."""
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def write_stream(chunks, path, compresslevel=FILING_COMPRESSLEVEL):
+    """
+    Write an iterable of byte chunks to path, gzip-compressed if path ends in .gz.
+
+    Data goes to path + ".part" first and is moved into place only once complete,
+    so an interrupted download never leaves a truncated filing behind. Returns the
+    number of uncompressed bytes written.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".part"
+    n_bytes = 0
+    try:
+        if path.endswith(".gz"):
+            f = gzip.open(tmp_path, "wb", compresslevel=compresslevel)
+        else:
+            f = open(tmp_path, "wb")
+        with f:
+            for chunk in chunks:
+                f.write(chunk)
+                n_bytes += len(chunk)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return n_bytes
+
+
+_latest_cache = {}
+
+
+def latest_filings(folder=SEC_FILINGS_PATH):
+    """{ticker: file name} of the most recent 10-K downloaded for each ticker.
+
+    The file is re-read only when it changes, so per-ticker lookups over a large
+    universe stay cheap.
+    """
+    path = os.path.join(folder, LATEST_FILINGS_FILE)
+    if not os.path.exists(path):
+        return {}
+    mtime = os.path.getmtime(path)
+    cached = _latest_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path) as f:
+            cached = _latest_cache[path] = (mtime, json.load(f))
+    return cached[1]
+
+
+def update_latest_filings(files, folder=SEC_FILINGS_PATH):
+    """Point tickers at newly downloaded files ({ticker: file name})."""
+    latest = {**latest_filings(folder), **files}
+    _latest_cache.pop(os.path.join(folder, LATEST_FILINGS_FILE), None)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, LATEST_FILINGS_FILE), "w") as f:
+        json.dump(latest, f, indent=2, sort_keys=True)
+    return latest
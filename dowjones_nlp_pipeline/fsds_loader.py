@@ -0,0 +1,162 @@
+import os
+import re
+import csv
+import glob
+import zipfile
+import pandas as pd
+from config import FSDS_PATH, FUNDAMENTALS_PATH, CIK_dict
+from filing_storage import DECODE_ERRORS
+
+# Financial Statement Data Sets (https://www.sec.gov/dera/data/financial-statement-data-sets):
+# one {year}q{quarter}.zip per quarter holding tab-separated sub.txt, num.txt, tag.txt, pre.txt
+FSDS_FILE_RE = re.compile(r'(\d{4})q([1-4])\.zip$')
+
+SUB_COLUMNS = {"adsh": "str", "cik": "int64", "form": "category", "fy": "Int16", "fp": "category", "filed": "int32"}
+NUM_COLUMNS = {"adsh": "str", "tag": "category", "version": "category", "ddate": "int32", "qtrs": "int8",
+               "uom": "category", "value": "float64"}
+# Rows for a co-registrant or a dimensional segment are not the consolidated figure
+NUM_SCOPE_COLUMNS = ("coreg", "segments")
+
+# Revenue, earnings and balance-sheet basics; tags=None loads every tag
+DEFAULT_TAGS = (
+    "Revenues",
+    "RevenueFromContractWithCustomerExcludingAssessedTax",
+    "SalesRevenueNet",
+    "NetIncomeLoss",
+    "OperatingIncomeLoss",
+    "EarningsPerShareDiluted",
+    "Assets",
+    "Liabilities",
+    "StockholdersEquity",
+    "NetCashProvidedByUsedInOperatingActivities",
+)
+
+PANEL_COLUMNS = ["Ticker", "CIK", "Tag", "Period", "Qtrs", "UOM", "Value", "Form", "Fiscal Year", "Fiscal Period",
+                 "Date Filed", "Accession"]
+
+
+def fsds_archives(years=None, path=FSDS_PATH):
+    """Local FSDS zip files, oldest first, optionally restricted to years."""
+    archives = []
+    for file in glob.glob(os.path.join(path, "*.zip")):
+        m = FSDS_FILE_RE.search(os.path.basename(file))
+        if m and (years is None or int(m.group(1)) in years):
+            archives.append(((int(m.group(1)), int(m.group(2))), file))
+    return [file for _, file in sorted(archives)]
+
+
+def _read_member(zf, name, usecols, dtype, chunksize=None):
+    return pd.read_csv(zf.open(name), sep="\t", usecols=usecols, dtype=dtype, quoting=csv.QUOTE_NONE,
+                       encoding="utf-8", encoding_errors=DECODE_ERRORS, chunksize=chunksize)
+
+
+def load_submissions(zf, ciks, forms=("10-K", "10-Q")):
+    """sub.txt rows of the given CIKs and forms, with compact dtypes."""
+    sub = _read_member(zf, "sub.txt", list(SUB_COLUMNS), SUB_COLUMNS)
+    sub = sub[sub["cik"].isin(ciks)]
+    if forms is not None:
+        sub = sub[sub["form"].isin(forms)]
+    return sub
+
+
+def load_numbers(zf, adshs, tags=DEFAULT_TAGS, chunksize=1_000_000):
+    """
+    num.txt facts of the given submissions, streamed in chunks.
+
+    Only the needed columns are parsed, and each chunk is filtered to the wanted
+    submissions, tags and consolidated (no co-registrant / segment) rows before the
+    next one is read, so memory stays proportional to what is kept.
+    """
+    with zf.open("num.txt") as f:
+        header = f.readline().decode("utf-8").rstrip("\r\n").split("\t")
+    scope = [c for c in NUM_SCOPE_COLUMNS if c in header]
+    usecols = [c for c in NUM_COLUMNS if c in header] + scope
+    dtype = {**NUM_COLUMNS, **{c: "str" for c in scope}}
+
+    adshs = set(adshs)
+    kept = []
+    for chunk in _read_member(zf, "num.txt", usecols, dtype, chunksize=chunksize):
+        mask = chunk["adsh"].isin(adshs)
+        if tags is not None:
+            mask &= chunk["tag"].isin(tags)
+        for col in scope:
+            mask &= chunk[col].isna()
+        if mask.any():
+            kept.append(chunk.loc[mask, [c for c in usecols if c not in scope]])
+    if not kept:
+        return pd.DataFrame({c: pd.Series(dtype=NUM_COLUMNS[c]) for c in NUM_COLUMNS})
+    # Categories differ between chunks, so restore them after the concat
+    num = pd.concat(kept, ignore_index=True)
+    for col in ("tag", "version", "uom"):
+        num[col] = num[col].astype("category")
+    return num
+
+
+def load_quarter(zip_path, ciks, tags=DEFAULT_TAGS, forms=("10-K", "10-Q")):
+    """Facts of one FSDS quarter for the given CIKs, joined to their submission data."""
+    with zipfile.ZipFile(zip_path) as zf:
+        sub = load_submissions(zf, ciks, forms)
+        num = load_numbers(zf, sub["adsh"], tags)
+    df = num.merge(sub, on="adsh", how="inner")
+    return pd.DataFrame({
+        "CIK": df["cik"].astype("int64"),
+        "Tag": df["tag"],
+        "Period": pd.to_datetime(df["ddate"].astype(str), format="%Y%m%d"),
+        "Qtrs": df["qtrs"],
+        "UOM": df["uom"],
+        "Value": df["value"],
+        "Form": df["form"],
+        "Fiscal Year": df["fy"],
+        "Fiscal Period": df["fp"],
+        "Date Filed": pd.to_datetime(df["filed"].astype(str), format="%Y%m%d"),
+        "Accession": df["adsh"],
+    })
+
+
+def build_fundamentals_panel(years=None, tickers=None, tags=DEFAULT_TAGS, forms=("10-K", "10-Q"), path=FSDS_PATH,
+                             save_path=FUNDAMENTALS_PATH, resolver=None):
+    """
+    Load FSDS facts for a universe into a (CIK, Tag, Period) panel and save it as Parquet.
+
+    tickers defaults to the DJIA names in CIK_dict and are resolved to CIKs with a
+    CIKResolver. Quarters are processed one at a time from local zips in FSDS_PATH.
+    The same fact is repeated in later filings as a comparative figure; the most
+    recently filed value is kept per (CIK, Tag, Period, Qtrs, UOM). Qtrs tells a
+    quarterly (1), annual (4) or point-in-time (0) value apart.
+    """
+    if resolver is None:
+        from cik_resolver import CIKResolver
+        resolver = CIKResolver()
+    ciks = resolver.resolve_many(list(CIK_dict) if tickers is None else tickers)
+    tickers_by_cik = {}
+    for ticker, cik in ciks.items():
+        tickers_by_cik.setdefault(cik, ticker)
+
+    frames = []
+    for zip_path in fsds_archives(years, path):
+        df = load_quarter(zip_path, set(ciks.values()), tags, forms)
+        print(f"📑 {os.path.basename(zip_path)}: {len(df)} facts")
+        frames.append(df)
+    if not frames:
+        print(f"⚠️ No Financial Statement Data Sets found in {path}")
+        return pd.DataFrame(columns=PANEL_COLUMNS)
+
+    panel = pd.concat(frames, ignore_index=True)
+    for col in ("Tag", "UOM", "Form", "Fiscal Period"):
+        panel[col] = panel[col].astype("category")
+    panel = (panel.sort_values("Date Filed", kind="stable")
+                  .drop_duplicates(["CIK", "Tag", "Period", "Qtrs", "UOM"], keep="last"))
+    panel.insert(0, "Ticker", panel["CIK"].map(tickers_by_cik).astype("category"))
+    panel = panel.sort_values(["CIK", "Tag", "Period", "Qtrs"]).reset_index(drop=True)
+
+    if save_path:
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        panel.to_parquet(save_path, index=False)
+        print(f"✅ Saved {len(panel)} facts to {save_path}")
+    return panel
+
+
+def load_fundamentals(path=FUNDAMENTALS_PATH, tags=None, columns=None):
+    """Read the saved panel, optionally only some tags and columns."""
+    filters = [("Tag", "in", list(tags))] if tags is not None else None
+    return pd.read_parquet(path, columns=columns, filters=filters)
@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from config import FULLTEXT_INDEX_PATH, TEXT_METRICS_TOKENIZER
+from metrics_cache import file_sha256
+from text_metrics import filing_tokens, tokenize, TAG_RE
+
+
+class FullTextIndex:
+    """
+    On-disk inverted index over downloaded SEC filings.
+
+    Postings are stored per (term, filing) with the term frequency and the token
+    positions, built from the same cleaned tokens analyze_filings scores. Filings are
+    identified by accession number, so a ticker's 10-K, 10-K/A and 10-Qs of one year
+    are separate documents, and are re-indexed only when their contents change.
+    """
+
+    def __init__(self, path=FULLTEXT_INDEX_PATH, primary_only=True, tokenizer=TEXT_METRICS_TOKENIZER):
+        self.path = path
+        self.primary_only = primary_only
+        self.tokenizer = tokenizer
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(docs)")]
+        if columns and "accession" not in columns:
+            # Indexes built before filings were keyed by accession are rebuilt from scratch
+            print(f"♻️ Rebuilding {path}: documents are now keyed by accession number")
+            self.conn.executescript("DROP TABLE docs; DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS terms;")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY, ticker TEXT, year INTEGER, form TEXT, accession TEXT UNIQUE,
+                path TEXT, sha256 TEXT, n_tokens INTEGER);
+            CREATE TABLE IF NOT EXISTS terms (term_id INTEGER PRIMARY KEY, term TEXT UNIQUE);
+            CREATE TABLE IF NOT EXISTS postings (
+                term_id INTEGER, doc_id INTEGER, tf INTEGER, positions BLOB,
+                PRIMARY KEY (term_id, doc_id)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+        """)
+        self._term_ids = None
+
+    def close(self):
+        self.conn.close()
+
+    # -----------------------------
+    # Building
+    # -----------------------------
+    def _load_term_ids(self):
+        if self._term_ids is None:
+            self._term_ids = dict(self.conn.execute("SELECT term, term_id FROM terms"))
+        return self._term_ids
+
+    def add_filing(self, ticker, year, filing_path, form="10-K", accession=None):
+        """Index one filing; returns False if it is already indexed with the same contents.
+
+        accession defaults to the file name, which is the accession number for stored filings.
+        """
+        if accession is None:
+            accession = os.path.basename(filing_path).split(".")[0]
+        content = file_sha256(filing_path)
+        row = self.conn.execute("SELECT doc_id, sha256 FROM docs WHERE accession = ?", (accession,)).fetchone()
+        if row and row[1] == content:
+            return False
+
+        tokens = filing_tokens(filing_path, primary_only=self.primary_only, tokenizer=self.tokenizer)
+        positions = defaultdict(list)
+        for i, t in enumerate(tokens):
+            positions[t].append(i)
+
+        term_ids = self._load_term_ids()
+        new_terms = [t for t in positions if t not in term_ids]
+        with self.conn:
+            if row:
+                doc_id = row[0]
+                self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                self.conn.execute(
+                    "UPDATE docs SET ticker = ?, year = ?, form = ?, path = ?, sha256 = ?, n_tokens = ?"
+                    " WHERE doc_id = ?", (ticker, int(year), form, filing_path, content, len(tokens), doc_id))
+            else:
+                doc_id = self.conn.execute(
+                    "INSERT INTO docs (ticker, year, form, accession, path, sha256, n_tokens)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (ticker, int(year), form, accession, filing_path, content, len(tokens)),
+                ).lastrowid
+            self.conn.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", [(t,) for t in new_terms])
+            if new_terms:
+                self._term_ids = None
+                term_ids = self._load_term_ids()
+            self.conn.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?, ?)",
+                [(term_ids[t], doc_id, len(p), np.asarray(p, dtype=np.uint32).tobytes())
+                 for t, p in positions.items()],
+            )
+        return True
+
+    def add_filings(self, filings):
+        """Incrementally index a DataFrame of Ticker, Year, Path; unchanged filings are skipped.
+
+        Form Type and Accession columns (as in a FilingCorpus manifest) are used when present.
+        """
+        added = 0
+        for row in filings.to_dict("records"):
+            form = row.get("Form Type", "10-K")
+            label = f"{row['Ticker']} {row['Year']} {form}"
+            if not os.path.exists(row["Path"]):
+                print(f"⚠️ Missing filing for {label}")
+                continue
+            if self.add_filing(row["Ticker"], row["Year"], row["Path"], form, row.get("Accession")):
+                added += 1
+                print(f"🗂 Indexed {label}")
+        print(f"✅ Indexed {added} new or changed filings")
+        return self
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def _normalize(self, text):
+        """Run query text through the same cleaning and tokenizer as the indexed filings."""
+        tokens, _ = tokenize(TAG_RE.sub(' ', text.lower()), self.tokenizer)
+        return tokens
+
+    def _postings(self, term):
+        return self.conn.execute(
+            "SELECT p.doc_id, p.tf, p.positions FROM postings p JOIN terms t ON p.term_id = t.term_id"
+            " WHERE t.term = ?", (term,)
+        ).fetchall()
+
+    def _to_frame(self, counts):
+        """{doc_id: count} -> DataFrame of Ticker, Year, Form Type, Accession, Count sorted by Ticker and Year."""
+        docs = pd.read_sql_query(
+            'SELECT doc_id, ticker AS Ticker, year AS Year, form AS "Form Type", accession AS Accession FROM docs',
+            self.conn)
+        counts_df = pd.DataFrame(list(counts.items()), columns=["doc_id", "Count"])
+        df = docs.merge(counts_df, on="doc_id", how="left").fillna({"Count": 0})
+        df["Count"] = df["Count"].astype(int)
+        return df.drop(columns="doc_id").sort_values(["Ticker", "Year", "Accession"]).reset_index(drop=True)
+
+    def term_counts(self, term):
+        """Occurrences of a single term in every indexed filing."""
+        tokens = self._normalize(term)
+        if len(tokens) != 1:
+            return self.phrase_counts(term)
+        return self._to_frame({doc_id: tf for doc_id, tf, _ in self._postings(tokens[0])})
+
+    def phrase_counts(self, phrase):
+        """Occurrences of an exact token sequence, matched on stored positions."""
+        tokens = self._normalize(phrase)
+        if not tokens:
+            return self._to_frame({})
+
+        # Start positions of the phrase, intersected term by term
+        starts = {doc_id: np.frombuffer(pos, dtype=np.uint32).astype(np.int64)
+                  for doc_id, _, pos in self._postings(tokens[0])}
+        for offset, token in enumerate(tokens[1:], start=1):
+            if not starts:
+                break
+            nxt = {}
+            for doc_id, _, pos in self._postings(token):
+                if doc_id in starts:
+                    shifted = np.frombuffer(pos, dtype=np.uint32).astype(np.int64) - offset
+                    kept = starts[doc_id][np.isin(starts[doc_id], shifted, assume_unique=True)]
+                    if len(kept):
+                        nxt[doc_id] = kept
+            starts = nxt
+        return self._to_frame({doc_id: len(p) for doc_id, p in starts.items()})
+
+    def prefix_counts(self, prefix):
+        """Occurrences of every term starting with prefix, summed per filing."""
+        prefix = prefix.lower()
+        rows = self.conn.execute(
+            "SELECT p.doc_id, SUM(p.tf) FROM postings p JOIN terms t ON p.term_id = t.term_id"
+            " WHERE t.term >= ? AND t.term < ? GROUP BY p.doc_id",
+            (prefix, prefix + "\U0010ffff"),
+        ).fetchall()
+        return self._to_frame(dict(rows))
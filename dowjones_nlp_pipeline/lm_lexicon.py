@@ -0,0 +1,134 @@
+import os
+from collections import deque
+
+# Loughran-McDonald category -> word list in data/reference/
+LM_CATEGORY_FILES = {
+    "Uncertainty": "LM_Uncertainty.txt",
+    "Positive": "LM_Positive.txt",
+    "Negative": "LM_Negative.txt",
+    "Litigious": "LM_Litigious.txt",
+    "Constraining": "LM_Constraining.txt",
+    "StrongModal": "LM_StrongModal.txt",
+    "WeakModal": "LM_WeakModal.txt",
+}
+
+# Categories behind the base Uncertainty and Tone scores; the rest are optional extras
+CORE_CATEGORIES = ("Uncertainty", "Positive", "Negative")
+
+REFERENCE_DIR = os.path.join("data", "reference")
+
+
+def category_path(category, reference_dir=REFERENCE_DIR):
+    return os.path.join(reference_dir, LM_CATEGORY_FILES.get(category, f"LM_{category}.txt"))
+
+
+def check_categories(categories, reference_dir=REFERENCE_DIR):
+    """Raise FileNotFoundError if a requested category has no word list, rather than scoring it as 0."""
+    missing = [c for c in categories if not os.path.exists(category_path(c, reference_dir))]
+    if missing:
+        paths = ", ".join(category_path(c, reference_dir) for c in missing)
+        raise FileNotFoundError(f"No LM word list for {', '.join(missing)} (expected {paths})")
+
+
+class LMLexicon:
+    """
+    Compiled Loughran-McDonald lexicon: every word maps to a category bitmask.
+
+    One lookup per word tells which categories it belongs to, so counting all
+    categories takes a single pass however many are loaded. Multi-word entries are
+    compiled into an Aho-Corasick automaton over token sequences and matched in one
+    left-to-right scan.
+    """
+
+    def __init__(self, categories=None, reference_dir=REFERENCE_DIR):
+        if categories is None:
+            # The core categories plus every optional one whose word list is present
+            categories = [c for c in LM_CATEGORY_FILES
+                          if c in CORE_CATEGORIES or os.path.exists(category_path(c, reference_dir))]
+        self.categories = []
+        self.files = {}
+        self.word_masks = {}
+        phrases = {}
+
+        for category in categories:
+            path = category_path(category, reference_dir)
+            if not os.path.exists(path):
+                print(f"⚠️ No LM word list for {category} ({path}); its counts will be 0")
+                continue
+            bit = 1 << len(self.categories)
+            self.categories.append(category)
+            self.files[category] = path
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    words = line.lower().split()
+                    if len(words) == 1:
+                        self.word_masks[words[0]] = self.word_masks.get(words[0], 0) | bit
+                    elif words:
+                        phrases[tuple(words)] = phrases.get(tuple(words), 0) | bit
+
+        self.bits = {c: 1 << i for i, c in enumerate(self.categories)}
+        self._build_automaton(phrases)
+
+    @property
+    def has_phrases(self):
+        return len(self._goto) > 1
+
+    def mask(self, word):
+        """Category bitmask of a single word (0 if it is in no category)."""
+        return self.word_masks.get(word, 0)
+
+    def add_counts(self, counts, mask, n=1):
+        """Add n to counts[category] for every category bit set in mask."""
+        for category, bit in self.bits.items():
+            if mask & bit:
+                counts[category] += n
+
+    def _build_automaton(self, phrases):
+        # State 0 is the root; _goto[state] maps a token to the next state
+        self._goto = [{}]
+        self._out = [0]
+        for phrase, mask in phrases.items():
+            state = 0
+            for token in phrase:
+                if token not in self._goto[state]:
+                    self._goto.append({})
+                    self._out.append(0)
+                    self._goto[state][token] = len(self._goto) - 1
+                state = self._goto[state][token]
+            self._out[state] |= mask
+
+        # Failure links by breadth-first search; outputs inherit their fallback's matches
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and token not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(token, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def count_phrases(self, tokens, counts=None):
+        """Count multi-word entries in a token sequence with the phrase automaton.
+
+        Each token position adds at most one to a category, even when several of its
+        phrases (e.g. "subject to litigation" and "to litigation") end there.
+        """
+        if counts is None:
+            counts = dict.fromkeys(self.categories, 0)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if out[state]:
+                self.add_counts(counts, out[state])
+        return counts
+
+    def words(self, category):
+        """Single-word entries of a category, as a set."""
+        bit = self.bits[category]
+        return {w for w, m in self.word_masks.items() if m & bit}
@@ -2,10 +2,13 @@ from data_fetcher import DataFetcher
 from portfolio_analysis import PortfolioAnalyzer
 from news_analysis import NewsAnalyzer
 from sec_data_fetcher import SECDataFetcher
-from text_metrics import analyze_filings
-from config import DOW_JONES_URL, START_DATE, END_DATE, PREDICTION_YEAR, DAYS_AFTER_FILING
-import nltk
+from text_metrics import analyze_filings, analyze_sections
+from utils.syllable_table import load_syllable_table
+from price_broker import get_broker
+from djia_membership import get_membership
+from config import DOW_JONES_URL, START_DATE, END_DATE, PREDICTION_YEAR, DAYS_AFTER_FILING, TEXT_METRICS_WORKERS
 import pandas as pd
+from datetime import date
 
 def main():
     # Step 1: Get Dow Jones tickers
@@ -13,12 +16,16 @@ def main():
     fetcher.save_tickers()  # saves to data/raw/djia_tickers.json
     print(f"✅ Found {len(fetcher.tickers)} tickers: {fetcher.tickers}")
 
+    # One merged price request for every range used below (training, backtest, prediction year);
+    # later steps are served from memory
+    get_broker().request(fetcher.tickers, START_DATE, date(PREDICTION_YEAR, 12, 31)).fetch()
+
     # Step 2: Get historical market data (training set)
     fetcher.get_market_data(start=START_DATE, end=END_DATE)
     print(f"✅ Got returns for {len(fetcher.data)} tickers")
 
-    # 💾 Save historical market data for .qmd use
-    fetcher.save_market_data(save_path="data/raw/djia_prices.pkl")
+    # 💾 Save historical market data for .qmd use (memory-mappable panel, see load_return_panel)
+    fetcher.save_market_data()
 
     # Optional: Preview one ticker's returns
     if fetcher.data:
@@ -26,11 +33,12 @@ def main():
         print(f"\n📈 Sample data for {first_ticker}:")
         print(fetcher.data[first_ticker].head())
 
-    # Step 3: Run portfolio analysis (in-sample)
+    # Step 3: Run portfolio analysis (in-sample), each window on the constituents of its time
     analyzer = PortfolioAnalyzer(
         tickers=fetcher.tickers,
         start_date=START_DATE,
-        end_date=END_DATE
+        end_date=END_DATE,
+        membership=get_membership()
     )
     analyzer.fetch_prices().run_overlapping_simulations()
 
@@ -84,8 +92,7 @@ def main():
     sec_fetcher.download_filings(url_df)
 
     # Step 13: Run integrated text metrics (Uncertainty, Tone, FOG, Flesch)
-    nltk.download('cmudict')
-    pronouncing_dict = nltk.corpus.cmudict.dict()
+    pronouncing_dict = load_syllable_table()
 
     import time
 
@@ -93,7 +100,7 @@ def main():
     test_tickers = fetcher.tickers
 
     start_total = time.time()
-    metrics_df = analyze_filings(test_tickers, pronouncing_dict)
+    metrics_df = analyze_filings(test_tickers, pronouncing_dict, workers=TEXT_METRICS_WORKERS, cache=True)
     print(metrics_df)
 
     print(f"\n⏱ Total time for {len(test_tickers)} filings: {time.time() - start_total:.2f} seconds")
@@ -101,5 +108,11 @@ def main():
     print("\n📊 Textual Analysis Metrics:")
     print(metrics_df.sort_values(by="Uncertainty", ascending=False))
 
+    # Step 14: Per-section metrics for Risk Factors (Item 1A) and MD&A (Item 7)
+    section_df = analyze_sections(test_tickers, sections=("1A", "7"), pronouncing_dict=pronouncing_dict,
+                                  workers=TEXT_METRICS_WORKERS)
+    print("\n📑 Section-Level Metrics (Item 1A / Item 7):")
+    print(section_df.sort_values(by=["Section", "Uncertainty"], ascending=[True, False]))
+
 if __name__ == "__main__":
     main()
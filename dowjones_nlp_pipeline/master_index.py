@@ -0,0 +1,126 @@
+import io
+import os
+import re
+import csv
+from datetime import date
+import pandas as pd
+from config import MASTER_INDEX_PATH
+from filing_storage import decode_bytes
+
+MASTER_INDEX_COLUMNS = ["CIK", "Company Name", "Form Type", "Date Filed", "Filename"]
+# Quarterly master.idx files say "Filename", daily ones "File Name"
+MASTER_INDEX_HEADER_RE = re.compile(r'^CIK\|Company Name\|Form Type\|Date Filed\|File ?Name', re.MULTILINE | re.IGNORECASE)
+QUARTERS = (1, 2, 3, 4)
+
+
+def parse_master_index(text):
+    """
+    Parse a master.idx file into a DataFrame in one vectorized read_csv pass.
+
+    CIK is int64, Form Type categorical and Date Filed datetime64 (quarterly files
+    write dates as 2020-01-31, daily ones as 20200131). Returns None if the header
+    row cannot be found.
+    """
+    m = MASTER_INDEX_HEADER_RE.search(text)
+    if m is None:
+        return None
+    df = pd.read_csv(
+        io.StringIO(text[m.start():]),
+        sep="|",
+        header=None,
+        names=MASTER_INDEX_COLUMNS,
+        skiprows=2,  # the header row and the dashed line under it
+        quoting=csv.QUOTE_NONE,
+        dtype={"CIK": "int64", "Company Name": str, "Form Type": "category", "Date Filed": str, "Filename": str},
+    )
+    date_format = "%Y-%m-%d" if df["Date Filed"].str.contains("-", regex=False).any() else "%Y%m%d"
+    df["Date Filed"] = pd.to_datetime(df["Date Filed"], format=date_format)
+    return df
+
+
+def _quarter_path(year, quarter, path):
+    return os.path.join(path, f"{year}_QTR{quarter}.parquet")
+
+
+def daily_index_path(year, quarter, path):
+    """Rows appended by daily-index ingestion (see daily_index.py) for a quarter in progress."""
+    return os.path.join(path, f"daily_{year}_QTR{quarter}.parquet")
+
+
+def _is_complete(year, quarter):
+    """A quarter's master.idx only stops changing once the quarter is over."""
+    today = date.today()
+    return (year, quarter) < (today.year, (today.month - 1) // 3 + 1)
+
+
+def fetch_master_index(years, path=MASTER_INDEX_PATH, downloader=None, refresh=False):
+    """Download and cache (as Parquet) every quarter of years that is not cached yet."""
+    if downloader is None:
+        from edgar_downloader import EdgarDownloader
+        downloader = EdgarDownloader()
+
+    # A quarter in progress that daily ingestion keeps current is not re-downloaded
+    missing = [(y, q) for y in years for q in QUARTERS
+               if refresh or (not os.path.exists(_quarter_path(y, q, path))
+                              and (_is_complete(y, q) or not os.path.exists(daily_index_path(y, q, path))))]
+    urls = [downloader.url(f"edgar/full-index/{y}/QTR{q}/master.idx") for y, q in missing]
+    frames = {}
+    os.makedirs(path, exist_ok=True)
+    for (y, q), resp in zip(missing, downloader.get_many(urls)):
+        if resp is None or resp.status_code != 200:
+            print(f"⚠️ Skipping {y} QTR{q} — got {'no response' if resp is None else f'HTTP {resp.status_code}'}")
+            continue
+
+        # Always decode as text, even if Content-Type is application/octet-stream
+        df = parse_master_index(decode_bytes(resp.content))
+        if df is None:
+            print(f"⚠️ Could not find header in {y} QTR{q}")
+            continue
+        frames[(y, q)] = df
+        if _is_complete(y, q):
+            df.to_parquet(_quarter_path(y, q, path), index=False)
+    return frames
+
+
+def load_master_index(years, form_types=None, columns=None, path=MASTER_INDEX_PATH, downloader=None,
+                      refresh=False):
+    """
+    The EDGAR master index for years, restricted to form_types and columns.
+
+    Quarters are read from the local Parquet cache, and only the requested columns
+    and form types are read from disk; quarters that are not cached are downloaded
+    first. A quarter still in progress is downloaded each time unless daily-index
+    ingestion keeps it up to date.
+    """
+    if isinstance(years, int):
+        years = [years]
+    if isinstance(form_types, str):
+        form_types = [form_types]
+    read_columns = None if columns is None else list(dict.fromkeys([*columns, *(["Form Type"] if form_types else [])]))
+
+    fetched = fetch_master_index(years, path, downloader, refresh)
+    frames = []
+    for y in years:
+        for q in QUARTERS:
+            if (y, q) in fetched:
+                df = fetched[(y, q)]
+                if form_types:
+                    df = df[df["Form Type"].isin(form_types)]
+                frames.append(df if read_columns is None else df[read_columns])
+            else:
+                quarter_path = _quarter_path(y, q, path)
+                if not os.path.exists(quarter_path):
+                    quarter_path = daily_index_path(y, q, path)
+                if os.path.exists(quarter_path):
+                    filters = [("Form Type", "in", list(form_types))] if form_types else None
+                    frames.append(pd.read_parquet(quarter_path, columns=read_columns, filters=filters))
+
+    if not frames:
+        return pd.DataFrame(columns=columns or MASTER_INDEX_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    if "Form Type" in df:
+        # Categories differ between quarters, so concat falls back to object
+        df["Form Type"] = df["Form Type"].astype("category")
+    if columns is not None:
+        df = df[list(columns)]
+    return df
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import sqlite3
+from config import METRICS_CACHE_PATH
+
+METRIC_COLUMNS = ["Uncertainty", "Tone", "FOG", "Readability"]
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Hex SHA-256 of a file's contents, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class MetricsCache:
+    """
+    Persistent store of per-filing text metrics.
+
+    Rows are keyed by the SHA-256 of the filing's contents combined with a fingerprint
+    of everything else that affects the scores (lexicon file hashes, metric code
+    version, scoring options), so a changed filing or lexicon is never served stale.
+    """
+
+    def __init__(self, path=METRICS_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS metrics ("
+                " key TEXT PRIMARY KEY, ticker TEXT, content_sha256 TEXT,"
+                " Uncertainty REAL, Tone REAL, FOG REAL, Readability REAL, extra TEXT)"
+            )
+            # Stores created before extra LM category columns existed
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(metrics)")]
+            if "extra" not in columns:
+                conn.execute("ALTER TABLE metrics ADD COLUMN extra TEXT")
+
+    @staticmethod
+    def key(filing_path, fingerprint):
+        """Return (cache key, content SHA-256) for a filing under a scoring fingerprint (a JSON-able dict)."""
+        content = file_sha256(filing_path)
+        context = json.dumps(fingerprint, sort_keys=True)
+        return hashlib.sha256(f"{content}|{context}".encode("utf-8")).hexdigest(), content
+
+    def get_many(self, keys, batch_size=500):
+        """Return {key: metrics dict} for the keys that are stored."""
+        keys = list(keys)
+        found = {}
+        with sqlite3.connect(self.path) as conn:
+            # Batched to stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), batch_size):
+                batch = keys[i:i + batch_size]
+                rows = conn.execute(
+                    f"SELECT key, {', '.join(METRIC_COLUMNS)}, extra FROM metrics"
+                    f" WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for row in rows:
+                    metrics = dict(zip(METRIC_COLUMNS, row[1:-1]))
+                    metrics.update(json.loads(row[-1] or "{}"))
+                    found[row[0]] = metrics
+        return found
+
+    def put_many(self, entries):
+        """Store (key, content_sha256, row) entries; row holds Ticker, the metric columns and any extras."""
+        with sqlite3.connect(self.path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO metrics"
+                " (key, ticker, content_sha256, Uncertainty, Tone, FOG, Readability, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (key, row["Ticker"], content, *(row[c] for c in METRIC_COLUMNS),
+                     json.dumps({c: v for c, v in row.items() if c != "Ticker" and c not in METRIC_COLUMNS}))
+                    for key, content, row in entries
+                ],
+            )
+
+    def clear(self):
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("DELETE FROM metrics")
@@ -1,12 +1,49 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
 from pandas_datareader import data as pdr
 from scipy.optimize import minimize
 from scipy.stats import norm
+from price_broker import get_broker
+from config import MONTE_CARLO_BLOCK_SIZE
+
+
+def uniform_weights(rng, block, N, max_weight=None):
+    """U(0,1) draws normalized to sum to 1 (the original sampler; draws row by row)."""
+    temp = rng.rand(block, N)
+    return temp / temp.sum(axis=1, keepdims=True)
+
+
+def dirichlet_weights(rng, block, N, max_weight=None, alpha=1.0):
+    """Flat Dirichlet(alpha): uniform over the simplex for alpha=1, sparser for alpha < 1."""
+    return rng.dirichlet(np.full(N, alpha), block)
+
+
+def capped_weights(rng, block, N, max_weight, tol=1e-9):
+    """Dirichlet draws with every weight clipped to max_weight, the excess spread over the rest."""
+    if max_weight * N < 1 - tol:
+        raise ValueError(f"max_weight={max_weight} cannot hold {N} weights summing to 1")
+    if max_weight * N <= 1 + tol:
+        # Every weight must sit at the cap, so there is no room to spread an excess into
+        return np.full((block, N), 1.0 / N)
+    weights = rng.dirichlet(np.ones(N), block)
+    for _ in range(N):
+        over = weights > max_weight
+        if not over.any():
+            break
+        excess = np.where(over, weights - max_weight, 0).sum(axis=1, keepdims=True)
+        weights = np.minimum(weights, max_weight)
+        room = np.where(weights < max_weight, weights, 0)
+        room_sum = room.sum(axis=1, keepdims=True)
+        weights += excess * np.divide(room, room_sum, out=np.zeros_like(room), where=room_sum > 0)
+    return weights
+
+
+WEIGHT_SAMPLERS = {"uniform": uniform_weights, "dirichlet": dirichlet_weights, "capped": capped_weights}
+
 
 class PortfolioAnalyzer:
-    def __init__(self, tickers, start_date, end_date, num_simul=50000, max_weight=0.10):
+    def __init__(self, tickers, start_date, end_date, num_simul=50000, max_weight=0.10, broker=None,
+                 membership=None, sampler="uniform", block_size=MONTE_CARLO_BLOCK_SIZE):
         self.tickers = tickers
         self.start_date = start_date
         self.end_date = end_date
@@ -15,59 +52,69 @@ class PortfolioAnalyzer:
         self.daily_prices = None
         self.results = {}
         self.year_ranges = []  # store ranges for reuse
+        self.broker = broker if broker is not None else get_broker()
+        # A DJIAMembership makes each window use the constituents on its first day
+        self.membership = membership
+        if sampler not in WEIGHT_SAMPLERS:
+            raise ValueError(f"Unknown sampler {sampler!r}; expected one of {tuple(WEIGHT_SAMPLERS)}")
+        self.sampler = sampler
+        self.block_size = block_size
 
     def fetch_prices(self):
-        self.daily_prices = yf.download(
-            self.tickers,
-            start=self.start_date,
-            end=self.end_date,
-            auto_adjust=True
-        )['Close'].dropna()
+        self.daily_prices = self.broker.field(self.tickers, self.start_date, self.end_date, 'Close').dropna()
         return self
 
     def run_overlapping_simulations(self):
         start_years = range(2010, 2022)
         end_years = range(2012, 2024)
         self.year_ranges = [f"{s}:{e}" for s, e in zip(start_years, end_years)]
+        if self.membership is not None:
+            # One merged request for every window's constituents
+            for s, e in zip(start_years, end_years):
+                self.broker.request(self._window_tickers(f"{s}-01-01"), f"{s}-01-01", f"{e}-12-31")
+            self.broker.fetch()
         for s, e in zip(start_years, end_years):
             self._simulate_for_range(s, e)
         return self.results
 
+    def _window_tickers(self, start_date_range):
+        """Tickers of a window: the index members on its first day, or self.tickers."""
+        if self.membership is None:
+            return self.tickers
+        return self.membership.members(start_date_range, yahoo=True)
+
+    def _window_prices(self, tickers, start_date_range, end_date_range):
+        prices = self.broker.field(tickers, start_date_range, end_date_range, 'Close')
+        missing = [t for t in tickers if t not in prices.columns or prices[t].isna().all()]
+        if missing:
+            print(f"⚠️ No prices for {missing} in {start_date_range}:{end_date_range}; leaving them out")
+        return prices.drop(columns=[t for t in missing if t in prices.columns]).dropna()
+
     def _simulate_for_range(self, start_year, end_year):
         start_date_range = f"{start_year}-01-01"
         end_date_range = f"{end_year}-12-31"
 
-        prices = self.daily_prices.loc[start_date_range:end_date_range]
+        if self.membership is None:
+            prices = self.daily_prices.loc[start_date_range:end_date_range]
+        else:
+            prices = self._window_prices(self._window_tickers(start_date_range), start_date_range, end_date_range)
+        tickers = list(prices.columns)
         monthly_prices = prices.resample('M').last()
         monthly_returns = monthly_prices.pct_change()
 
         mu_vec = np.array(monthly_returns.mean() * 12)
         cov_mat = np.array(monthly_returns.cov() * 12)
-        N = len(self.tickers)
+        N = len(tickers)
 
-        port_expret = np.empty(self.num_simul)
-        port_var = np.empty(self.num_simul)
-        weights = np.empty((self.num_simul, N))
-        np.random.seed(100)
-
-        for i in range(self.num_simul):
-            temp = np.random.rand(N)
-            weights[i] = temp / temp.sum()
-            port_expret[i] = np.dot(weights[i].T, mu_vec)
-            port_var[i] = np.dot(weights[i].T, np.dot(cov_mat, weights[i]))
+        tenyr_yield = pdr.DataReader('DGS10', 'fred', start_date_range, end_date_range).dropna()
+        rf = tenyr_yield.iloc[0][0] / 100
 
-        port_sd = np.sqrt(port_var)
+        sd_weights, maxSR_weights = self._simulate_weights(mu_vec, cov_mat, rf)
 
         def portsd_func(w, covmat):
             return np.sqrt(np.dot(w.T, np.dot(covmat, w)))
 
-        sd_weights = weights[port_sd.argmin()]
-        optweights = pd.DataFrame(sd_weights, index=self.tickers, columns=['Min_Var_Sim'])
-
-        tenyr_yield = pdr.DataReader('DGS10', 'fred', start_date_range, end_date_range).dropna()
-        rf = tenyr_yield.iloc[0][0] / 100
-        sharpes = (port_expret - rf) / port_sd
-        maxSR_weights = weights[sharpes.argmax()]
+        optweights = pd.DataFrame(sd_weights, index=tickers, columns=['Min_Var_Sim'])
         optweights['Max_SR_Sim'] = maxSR_weights
 
         Sinv = np.linalg.inv(cov_mat)
@@ -105,27 +152,67 @@ class PortfolioAnalyzer:
 
         self.results[f"{start_year}:{end_year}"] = {'DF': optweights}
 
+    def _simulate_weights(self, mu_vec, cov_mat, rf):
+        """
+        Monte Carlo frontier: weights of the minimum-SD and maximum-Sharpe simulated portfolios.
+
+        Weights are drawn in blocks of block_size rows, their returns and variances
+        computed for the whole block at once (a matrix product and an einsum), and only
+        the best portfolio so far is kept, so memory is O(block_size * N) for any
+        num_simul. With the uniform sampler the draws, and so the results, are the same
+        as drawing one weight vector at a time with seed 100.
+        """
+        N = len(mu_vec)
+        rng = np.random.RandomState(100)
+        sample = WEIGHT_SAMPLERS[self.sampler]
+        best_sd, best_sharpe = np.inf, -np.inf
+        sd_weights = maxSR_weights = None
+
+        for start in range(0, self.num_simul, self.block_size):
+            block = min(self.block_size, self.num_simul - start)
+            weights = sample(rng, block, N, self.max_weight)
+            port_expret = weights @ mu_vec
+            port_sd = np.sqrt(np.einsum('ij,jk,ik->i', weights, cov_mat, weights, optimize=True))
+            sharpes = (port_expret - rf) / port_sd
+
+            # Strict comparisons keep the first of equal portfolios, like argmin/argmax over all draws
+            i = port_sd.argmin()
+            if port_sd[i] < best_sd:
+                best_sd, sd_weights = port_sd[i], weights[i].copy()
+            i = sharpes.argmax()
+            if sharpes[i] > best_sharpe:
+                best_sharpe, maxSR_weights = sharpes[i], weights[i].copy()
+
+        return sd_weights, maxSR_weights
+
     def backtest_max_sharpe(self, lookahead=3):
         """Backtest analytical Max Sharpe weights out-of-sample."""
         results = []
-        N = len(self.tickers)
+
+        # Request every investment window at once (for the tickers held from the training
+        # window); the loop below is served from memory
+        for s in range(len(self.year_ranges) - lookahead):
+            start_year_next, end_year_next = map(int, self.year_ranges[s + lookahead].split(":"))
+            held = list(self.results[self.year_ranges[s]]['DF'].index)
+            self.broker.request(held, f"{start_year_next}-01-01", f"{end_year_next}-12-31")
+        self.broker.fetch()
 
         for s in range(len(self.year_ranges) - lookahead):
             training_period = self.year_ranges[s]
             investment_period = self.year_ranges[s + lookahead]
 
-            current_weights = self.results[training_period]['DF']['Max_SR_Act'].values
+            current_weights = self.results[training_period]['DF']['Max_SR_Act']
 
             start_year_next, end_year_next = map(int, investment_period.split(":"))
             start_date_range_next = f"{start_year_next}-01-01"
             end_date_range_next = f"{end_year_next}-12-31"
 
-            DJ_DailyAdjClose_next = yf.download(
-                self.tickers,
-                start=start_date_range_next,
-                end=end_date_range_next,
-                auto_adjust=True
-            )['Close'].dropna()
+            DJ_DailyAdjClose_next = self.broker.field(
+                list(current_weights.index), start_date_range_next, end_date_range_next, 'Close'
+            ).dropna()
+            # A held ticker without prices in the investment window (e.g. delisted) is dropped
+            current_weights = current_weights.reindex(DJ_DailyAdjClose_next.columns).values
+            N = len(current_weights)
 
             DJ_MonthlyAdjClose_next = DJ_DailyAdjClose_next.resample('M').last()
             DJ_MonthlyReturns_next = DJ_MonthlyAdjClose_next.pct_change()
@@ -1,16 +1,31 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
-from config import CIK_dict, DAYS_AFTER_FILING
+from config import DAYS_AFTER_FILING
+from filing_index import FilingIndex
+from cik_resolver import CIKResolver
+from price_broker import get_broker
 
-def get_prices_after_filing(tickers, tenk_df):
-    """Fetch daily Close prices for DAYS_AFTER_FILING days after each 10-K filing."""
+def get_prices_after_filing(tickers, tenk_df, policy="first", resolver=None, broker=None, as_of=None):
+    """Fetch daily Close prices for DAYS_AFTER_FILING days after each 10-K filing.
+
+    tenk_df is a master-index DataFrame or a prebuilt FilingIndex; policy picks which
+    10-K per ticker sets the date (see FilingIndex.filings). Tickers are mapped to CIKs
+    with resolver (a CIKResolver), so any listed company works, not only CIK_dict, as
+    of as_of (default the last filing date in the index) so renamed tickers map to the
+    company that held them then.
+    Every ticker's window is requested from the price broker at once, so overlapping
+    windows are merged into batched downloads.
+    """
     date_dict = {"Ticker": [], "Date": []}
+    index = tenk_df if isinstance(tenk_df, FilingIndex) else FilingIndex(tenk_df)
+    if resolver is None:
+        resolver = CIKResolver()
+    if as_of is None and not index.data.empty:
+        as_of = index.data["Date Filed"].max()
 
     # Build filing date table
-    for ticker in tickers:
-        cik = CIK_dict[ticker]
-        company_data = tenk_df[(tenk_df['CIK'] == str(cik)) & (tenk_df['Form Type'] == '10-K')]
+    for ticker, cik in resolver.resolve_many(tickers, as_of=as_of).items():
+        company_data = index.filings(cik, forms=("10-K",), policy=policy)
         if company_data.empty:
             print(f"⚠️ No 10-K found for {ticker}")
             continue
@@ -22,16 +37,23 @@ def get_prices_after_filing(tickers, tenk_df):
     date_df["Date"] = pd.to_datetime(date_df["Date"])
 
     # Download Close prices
+    if broker is None:
+        broker = get_broker()
+    np.random.seed(1)
+    windows = {}
+    for ticker, filed in zip(date_df["Ticker"], date_df["Date"]):
+        start_date = filed + pd.DateOffset(days=1)
+        windows[ticker] = (start_date, start_date + pd.DateOffset(days=DAYS_AFTER_FILING))
+        broker.request([ticker], *windows[ticker])
+    broker.fetch()
+
     stock_prices_dict = {}
-    for ticker in date_df["Ticker"]:
-        np.random.seed(1)
-        start_date = date_df.loc[date_df["Ticker"] == ticker, "Date"].iloc[0] + pd.DateOffset(days=1)
-        end_date = start_date + pd.DateOffset(days=DAYS_AFTER_FILING)
-        try:
-            prices = yf.download(ticker, start=start_date, end=end_date)["Close"]
-            stock_prices_dict[ticker] = prices
-        except Exception as e:
-            print(f"⚠️ Failed to fetch prices for {ticker}: {e}")
+    for ticker, (start_date, end_date) in windows.items():
+        prices = broker.bars(ticker, start_date, end_date)["Close"]
+        if prices.empty:
+            print(f"⚠️ Failed to fetch prices for {ticker}")
+            continue
+        stock_prices_dict[ticker] = prices
 
     return pd.concat(stock_prices_dict) if stock_prices_dict else pd.DataFrame()
 
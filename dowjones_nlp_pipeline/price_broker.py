@@ -0,0 +1,182 @@
+from functools import lru_cache
+import pandas as pd
+from config import PRICE_BROKER_WORKERS, PRICE_BROKER_BATCH_SIZE, PRICE_COLUMNS
+from price_store import PriceStore, clean_bars, _day
+
+# Unadjusted downloads also carry the dividend/split-adjusted close
+UNADJUSTED_COLUMNS = PRICE_COLUMNS + ["Adj Close"]
+
+
+def yahoo_download_many(tickers, start, end, adjusted=True, workers=PRICE_BROKER_WORKERS):
+    """
+    {ticker: daily bars in [start, end)} from one multi-ticker yf.download call.
+
+    yfinance fetches the tickers on its own pool of `workers` threads; yf.download
+    keeps module-level state, so calls themselves are not run concurrently.
+    """
+    import yfinance as yf
+    df = yf.download(list(tickers), start=start, end=end, interval="1d", auto_adjust=adjusted, group_by="ticker",
+                     progress=False, threads=workers if workers > 1 else False)
+    bars = {}
+    for ticker in tickers:
+        if isinstance(df.columns, pd.MultiIndex):
+            if ticker not in df.columns.get_level_values(0):
+                continue
+            bars[ticker] = df[ticker].dropna(how="all")
+        else:
+            bars[ticker] = df.dropna(how="all")
+    return bars
+
+
+def _merge_ranges(plans):
+    """Group {ticker: (start, end)} into [(start, end, tickers)] with overlapping ranges merged."""
+    groups = []
+    for ticker, (start, end) in sorted(plans.items(), key=lambda item: item[1]):
+        if groups and start <= groups[-1][1]:
+            groups[-1][1] = max(groups[-1][1], end)
+            groups[-1][2].append(ticker)
+        else:
+            groups.append([start, end, [ticker]])
+    return [tuple(g) for g in groups]
+
+
+class PriceBroker:
+    """
+    One price-access layer shared by every module that needs daily bars.
+
+    Requests for (tickers, date range) are queued with request() and resolved
+    together by fetch(): overlapping ranges are merged (store tails separately from
+    full histories), and the tickers of each merged range are downloaded in
+    multi-ticker batches of batch_size, with yfinance's pool bounded to `workers`
+    threads. Adjusted bars go through the PriceStore, so only the days it lacks are
+    downloaded; unadjusted bars (Adj Close) are kept in memory only. Everything
+    loaded is held in memory, and bars()/field() serve slices of it.
+    """
+
+    def __init__(self, store=None, download=yahoo_download_many, workers=PRICE_BROKER_WORKERS,
+                 batch_size=PRICE_BROKER_BATCH_SIZE):
+        self.store = store if store is not None else PriceStore()
+        self.download = download
+        self.workers = workers
+        self.batch_size = batch_size
+        self._frames = {}   # (adjusted, ticker) -> bars loaded in memory
+        self._ranges = {}   # (adjusted, ticker) -> (start, end) held by _frames
+        self._pending = {}  # (adjusted, ticker) -> (start, end) requested, not fetched yet
+
+    # -----------------------------
+    # Requests
+    # -----------------------------
+    def _loaded(self, key, start, end):
+        held = self._ranges.get(key)
+        return held is not None and held[0] <= start and end <= held[1]
+
+    def request(self, tickers, start, end, adjusted=True):
+        """Queue [start, end) for tickers; fetch() downloads every queued request together."""
+        start, end = _day(start), _day(end)
+        for ticker in dict.fromkeys(tickers):
+            key = (adjusted, ticker)
+            if self._loaded(key, start, end):
+                continue
+            lo, hi = self._pending.get(key, (start, end))
+            self._pending[key] = (min(lo, start), max(hi, end))
+        return self
+
+    def fetch(self):
+        """Resolve the queued requests with merged, batched downloads and load them into memory."""
+        pending, self._pending = self._pending, {}
+        for adjusted in (True, False):
+            wanted = {}
+            for (adj, ticker), (start, end) in pending.items():
+                if adj == adjusted:
+                    held = self._ranges.get((adj, ticker))
+                    wanted[ticker] = (min(start, held[0]), max(end, held[1])) if held else (start, end)
+            if not wanted:
+                continue
+            if adjusted:
+                self._fetch_into_store(wanted)
+                for ticker, (start, end) in wanted.items():
+                    df = self.store.read(ticker, start, end)
+                    self._frames[(True, ticker)] = df
+                    if not df.empty:  # a failed download is requested again next time
+                        self._ranges[(True, ticker)] = (start, end)
+            else:
+                for ticker, bars in self._download(wanted, adjusted).items():
+                    start, end = wanted[ticker]
+                    self._frames[(adjusted, ticker)] = bars[(bars.index >= start) & (bars.index < end)]
+                    self._ranges[(adjusted, ticker)] = (start, end)
+        return self
+
+    def _download(self, plans, adjusted=True):
+        """{ticker: bars} for {ticker: (start, end)}, one download per merged range and batch."""
+        bars = {}
+        for start, end, tickers in _merge_ranges(plans):
+            for i in range(0, len(tickers), self.batch_size):
+                batch = tickers[i:i + self.batch_size]
+                try:
+                    result = self.download(batch, start.date(), end.date(), adjusted=adjusted, workers=self.workers)
+                except Exception as e:
+                    print(f"❌ Failed to fetch {', '.join(batch)}: {e}")
+                    continue
+                for ticker in batch:
+                    ticker_bars = clean_bars(result.get(ticker), PRICE_COLUMNS if adjusted else UNADJUSTED_COLUMNS)
+                    # An all-NaN column is yfinance reporting a failure; leave it to be retried
+                    if ticker_bars.empty:
+                        print(f"⚠️ No data returned for {ticker}")
+                        continue
+                    bars[ticker] = ticker_bars
+        return bars
+
+    def _fetch_into_store(self, wanted):
+        """Download what the store lacks for {ticker: (start, end)} and merge it in."""
+        plans = {}
+        for ticker, (start, end) in wanted.items():
+            plan = self.store.missing(ticker, start, end)
+            if plan is not None:
+                plans[ticker] = plan
+        for _ in range(2):  # the second round re-downloads re-adjusted histories
+            if not plans:
+                return
+            # Tails (last stored day -> today) are merged only with each other, so a ticker
+            # missing a few days is never widened to another ticker's full history
+            downloaded = self._download({t: (s, e) for t, (s, e, tail) in plans.items() if tail})
+            downloaded.update(self._download({t: (s, e) for t, (s, e, tail) in plans.items() if not tail}))
+            redo = {}
+            for ticker, (start, end, tail) in plans.items():
+                if ticker not in downloaded:
+                    continue
+                bars = downloaded[ticker]
+                bars = bars[(bars.index >= start) & (bars.index < end)]
+                if self.store.merge(ticker, bars, start, end, tail) is None:
+                    print(f"♻️ {ticker} prices were re-adjusted — downloading the full history again")
+                    redo[ticker] = (_day(self.store.coverage[ticker]["Start"]), end, False)
+            plans = redo
+
+    # -----------------------------
+    # Access
+    # -----------------------------
+    def bars(self, ticker, start, end, adjusted=True):
+        """Daily bars of ticker in [start, end), fetched first if not in memory."""
+        start, end = _day(start), _day(end)
+        key = (adjusted, ticker)
+        if not self._loaded(key, start, end):
+            self.request([ticker], start, end, adjusted).fetch()
+        df = self._frames.get(key)
+        if df is None:
+            return clean_bars(None, PRICE_COLUMNS if adjusted else UNADJUSTED_COLUMNS)
+        return df[(df.index >= start) & (df.index < end)]
+
+    def field(self, tickers, start, end, field="Close", adjusted=True):
+        """One field (e.g. "Close") for several tickers as a Date x ticker DataFrame."""
+        self.request(tickers, start, end, adjusted).fetch()
+        columns = {}
+        for ticker in tickers:
+            df = self.bars(ticker, start, end, adjusted)
+            if not df.empty and field in df.columns:
+                columns[ticker] = df[field]
+        return pd.DataFrame(columns)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """Process-wide broker, so all modules share one in-memory price cache."""
+    return PriceBroker()
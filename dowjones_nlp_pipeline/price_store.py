@@ -0,0 +1,217 @@
+import os
+import json
+import time
+from datetime import date
+import pandas as pd
+from config import PRICE_STORE_PATH, PRICE_COLUMNS
+
+# Per-ticker coverage (requested start, exclusive end, last stored trading day)
+COVERAGE_FILE = "coverage.json"
+
+# Relative Close difference on the overlap day that means Yahoo re-adjusted the history
+READJUST_TOLERANCE = 1e-6
+
+
+def _day(value):
+    return pd.Timestamp(value).normalize()
+
+
+def yahoo_download(ticker, start, end):
+    """Daily auto-adjusted OHLCV bars for one ticker in [start, end), with flat columns."""
+    import yfinance as yf
+    df = yf.download(ticker, start=start, end=end, interval="1d", auto_adjust=True, progress=False, threads=False)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    return df
+
+
+def clean_bars(df, columns=PRICE_COLUMNS):
+    """Downloaded bars restricted to columns, indexed by a naive, normalized Date."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name="Date"))
+    df = df[[c for c in columns if c in df.columns]].dropna(how="all")
+    df.index = pd.DatetimeIndex(df.index).tz_localize(None).normalize().rename("Date")
+    return df
+
+
+class PriceStore:
+    """
+    Local daily price store: one Parquet file per ticker plus a coverage file.
+
+    The coverage file records, per ticker, the date range already requested from
+    Yahoo and the last stored trading day, so a fetch only downloads the missing
+    tail (from the last stored day on) and appends it. Prices are auto-adjusted; if
+    the overlapping day no longer matches (a dividend or split re-adjusted the
+    history), the ticker's whole range is downloaded again. A start earlier than the
+    stored one also re-downloads the range. Reads select the requested dates with a
+    Parquet filter.
+    """
+
+    def __init__(self, path=PRICE_STORE_PATH, download=yahoo_download, pause=0.0):
+        self.path = path
+        self.download = download
+        self.pause = pause
+        self._coverage = None
+
+    # -----------------------------
+    # Coverage
+    # -----------------------------
+    @property
+    def coverage(self):
+        """{ticker: {"Start", "End", "Last Date"}} as ISO dates, loaded once."""
+        if self._coverage is None:
+            coverage_path = os.path.join(self.path, COVERAGE_FILE)
+            self._coverage = {}
+            if os.path.exists(coverage_path):
+                with open(coverage_path) as f:
+                    self._coverage = json.load(f)
+        return self._coverage
+
+    def _save_coverage(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = os.path.join(self.path, COVERAGE_FILE + ".part")
+        with open(tmp_path, "w") as f:
+            json.dump(self.coverage, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.path, COVERAGE_FILE))
+
+    def covers(self, ticker, start, end):
+        """True if [start, end) has already been requested for ticker."""
+        entry = self.coverage.get(ticker)
+        if entry is None:
+            return False
+        return _day(entry["Start"]) <= _day(start) and _day(end) <= _day(entry["End"])
+
+    def last_date(self, ticker):
+        """Last stored trading day of ticker, or None."""
+        entry = self.coverage.get(ticker)
+        return _day(entry["Last Date"]) if entry and entry["Last Date"] else None
+
+    # -----------------------------
+    # Reading / writing
+    # -----------------------------
+    def ticker_path(self, ticker):
+        return os.path.join(self.path, f"{ticker}.parquet")
+
+    def read(self, ticker, start=None, end=None, columns=None):
+        """Stored bars of ticker in [start, end), indexed by Date."""
+        path = self.ticker_path(ticker)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=columns or PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+        filters = []
+        if start is not None:
+            filters.append(("Date", ">=", _day(start)))
+        if end is not None:
+            filters.append(("Date", "<", _day(end)))
+        read_columns = None if columns is None else ["Date", *columns]
+        df = pd.read_parquet(path, columns=read_columns, filters=filters or None)
+        return df.set_index("Date").sort_index()
+
+    def _write(self, ticker, df):
+        os.makedirs(self.path, exist_ok=True)
+        path = self.ticker_path(ticker)
+        df.rename_axis("Date").reset_index().to_parquet(path + ".part", index=False)
+        os.replace(path + ".part", path)
+
+    def _fetch(self, ticker, start, end):
+        df = self.download(ticker, start.date(), end.date())
+        if self.pause:
+            time.sleep(self.pause)  # avoid hammering Yahoo
+        return clean_bars(df)
+
+    # -----------------------------
+    # Updating
+    # -----------------------------
+    def missing(self, ticker, start, end):
+        """
+        What still has to be downloaded for the store to cover [start, end) for ticker.
+
+        Returns None if nothing is missing, else (fetch_start, fetch_end, tail). end is
+        capped at today: today's bar is not final, so it is fetched again next time. A
+        tail starts at the last stored day, which is downloaded again to check that the
+        adjustment still holds; otherwise the whole (widened) range is downloaded.
+        """
+        start, end = _day(start), min(_day(end), _day(date.today()))
+        entry = self.coverage.get(ticker)
+        if end <= start or self.covers(ticker, start, end):
+            return None
+        if entry:
+            start, end = min(start, _day(entry["Start"])), max(end, _day(entry["End"]))
+        last = self.last_date(ticker)
+        if last is not None and start == _day(entry["Start"]):
+            return last, end, True
+        return start, end, False
+
+    def merge(self, ticker, bars, start, end, tail=False):
+        """
+        Store bars downloaded for a missing() range and extend the coverage.
+
+        Returns the number of new rows, or None when a tail no longer matches the stored
+        last day (the history was re-adjusted) and the full range must be downloaded.
+        """
+        bars = clean_bars(bars)
+        stored = self.read(ticker) if ticker in self.coverage else None
+        if tail:
+            last = self.last_date(ticker)
+            if bars.empty:
+                print(f"⚠️ No new data for {ticker}")
+                return 0
+            if last not in bars.index or abs(bars.loc[last, "Close"] / stored.loc[last, "Close"] - 1) > READJUST_TOLERANCE:
+                return None
+            new = bars[bars.index > last]
+            df = pd.concat([stored, new])
+            fetched = len(new)
+            start = _day(self.coverage[ticker]["Start"])
+        else:
+            if bars.empty:
+                # yfinance reports rate limits and errors as an empty frame, so nothing is
+                # recorded as covered and the range is requested again next time
+                print(f"⚠️ No data returned for {ticker}" + ("; keeping the stored prices" if stored is not None else ""))
+                return 0
+            df = bars
+            fetched = len(bars)
+
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        if not df.empty:
+            self._write(ticker, df)
+        self.coverage[ticker] = {
+            "Start": start.date().isoformat(),
+            "End": end.date().isoformat(),
+            "Last Date": df.index[-1].date().isoformat() if not df.empty else None,
+        }
+        self._save_coverage()
+        return fetched
+
+    def update(self, ticker, start, end):
+        """Make the store cover [start, end) for ticker, downloading only what is missing.
+
+        Returns the number of rows downloaded.
+        """
+        plan = self.missing(ticker, start, end)
+        if plan is None:
+            return 0
+        start, end, tail = plan
+        fetched = self.merge(ticker, self._fetch(ticker, start, end), start, end, tail)
+        if fetched is None:
+            print(f"♻️ {ticker} prices were re-adjusted — downloading the full history again")
+            start = _day(self.coverage[ticker]["Start"])
+            fetched = self.merge(ticker, self._fetch(ticker, start, end), start, end)
+        return fetched
+
+    def get(self, ticker, start, end, columns=None):
+        """Bars of ticker in [start, end), downloading the missing part first."""
+        try:
+            self.update(ticker, start, end)
+        except Exception as e:
+            print(f"❌ Failed to update {ticker}: {e}")
+        return self.read(ticker, start, end, columns)
+
+    def get_many(self, tickers, start, end, columns=None):
+        """{ticker: bars} for tickers with data in [start, end)."""
+        prices = {}
+        for ticker in tickers:
+            df = self.get(ticker, start, end, columns)
+            if df.empty:
+                print(f"⚠️ No data for {ticker}, skipping.")
+                continue
+            prices[ticker] = df
+        return prices
@@ -0,0 +1,98 @@
+import os
+import numpy as np
+import pandas as pd
+from config import RETURN_PANEL_PATH, RETURN_PANEL_FIELDS, RETURN_PANEL_DTYPE
+
+# A panel directory holds dates.npy (datetime64[D]), tickers.npy (str) and one
+# {field}.npy per field: a dates x tickers float array, NaN where a ticker has no row
+DATES_FILE = "dates.npy"
+TICKERS_FILE = "tickers.npy"
+
+
+def _field_file(field):
+    return f"{field.lower().replace(' ', '_')}.npy"
+
+
+def _save_array(path, array):
+    # np.save appends .npy to names that lack it, so write to a .part.npy name
+    tmp_path = path[:-len(".npy")] + ".part.npy"
+    np.save(tmp_path, array, allow_pickle=False)
+    os.replace(tmp_path, path)
+
+
+def save_return_panel(data, path=RETURN_PANEL_PATH, fields=RETURN_PANEL_FIELDS, dtype=RETURN_PANEL_DTYPE):
+    """
+    Save {ticker: returns DataFrame} as an aligned panel of .npy files.
+
+    Dates are the union of all tickers' dates; each field becomes one C-ordered
+    dates x tickers array of dtype (float64 or float32), so loading is a memory map
+    rather than a rebuild of aligned matrices.
+    """
+    tickers = list(data)
+    os.makedirs(path, exist_ok=True)
+    dates = None
+    for field in fields:
+        wide = pd.concat({t: df[field] for t, df in data.items() if field in df.columns}, axis=1)
+        wide = wide.reindex(columns=tickers).sort_index()
+        if dates is None:
+            dates = wide.index
+        wide = wide.reindex(dates)
+        _save_array(os.path.join(path, _field_file(field)), np.ascontiguousarray(wide.to_numpy(dtype=dtype)))
+    _save_array(os.path.join(path, DATES_FILE), pd.DatetimeIndex(dates).to_numpy().astype("datetime64[D]"))
+    _save_array(os.path.join(path, TICKERS_FILE), np.array(tickers, dtype=str))
+    print(f"✅ Saved {len(tickers)} tickers x {len(dates)} days ({', '.join(fields)}) to {path}")
+
+
+class ReturnPanel:
+    """
+    Dates x tickers return array with its date and ticker index.
+
+    Loaded with mmap=True the array is a read-only memory map: nothing is read until
+    it is used, and processes that map the same file share its pages through the OS
+    page cache instead of each holding a copy. values, column() and between() return
+    NumPy views; frame() and series() wrap them in pandas without copying.
+    """
+
+    def __init__(self, dates, tickers, values, field="Close"):
+        self.dates = dates
+        self.tickers = tickers
+        self.values = values
+        self.field = field
+        self._positions = {t: i for i, t in enumerate(tickers.tolist())}
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __contains__(self, ticker):
+        return ticker in self._positions
+
+    def column(self, ticker):
+        """Returns of one ticker (a strided view into values)."""
+        return self.values[:, self._positions[ticker]]
+
+    def between(self, start=None, end=None):
+        """Panel restricted to dates in [start, end), sharing the same memory."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start), "D")))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end), "D")))
+        return ReturnPanel(self.dates[lo:hi], self.tickers, self.values[lo:hi], self.field)
+
+    @property
+    def index(self):
+        return pd.DatetimeIndex(self.dates.astype("datetime64[ns]"), name="Date")
+
+    def frame(self):
+        """Date x ticker DataFrame over values (no copy)."""
+        return pd.DataFrame(self.values, index=self.index, columns=pd.Index(self.tickers.tolist()), copy=False)
+
+    def series(self, ticker):
+        """One ticker's returns as a Series over its column view."""
+        return pd.Series(self.column(ticker), index=self.index, name=ticker, copy=False)
+
+
+def load_return_panel(path=RETURN_PANEL_PATH, field="Close", mmap=True):
+    """Open a saved panel field; mmap=False reads the array into memory instead."""
+    mmap_mode = "r" if mmap else None
+    dates = np.load(os.path.join(path, DATES_FILE), mmap_mode=mmap_mode, allow_pickle=False)
+    tickers = np.load(os.path.join(path, TICKERS_FILE), allow_pickle=False)
+    values = np.load(os.path.join(path, _field_file(field)), mmap_mode=mmap_mode, allow_pickle=False)
+    return ReturnPanel(dates, tickers, values, field)
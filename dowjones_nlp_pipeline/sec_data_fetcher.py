@@ -1,103 +1,97 @@
 import os
-import time
-import requests
 import pandas as pd
-from config import SEC_HEADERS, CIK_dict, SEC_FILINGS_PATH
+from config import CIK_dict, SEC_FILINGS_PATH
+from edgar_downloader import EdgarDownloader
+from master_index import load_master_index
+from filing_index import FilingIndex, amended
+from cik_resolver import CIKResolver
+from filing_storage import filing_file_name, update_latest_filings, accession_from_filename
 
 class SECDataFetcher:
-    def __init__(self, year):
+    def __init__(self, year, downloader=None, tickers=None, resolver=None):
         self.year = year
         self.data = pd.DataFrame()
+        self.form_types = None  # forms requested from get_master_index (None = every form)
+        # Shared, rate-limited HTTP client (see edgar_downloader.py)
+        self.downloader = downloader if downloader is not None else EdgarDownloader()
+        # Universe: the DJIA names in CIK_dict by default, any resolvable tickers otherwise
+        self.resolver = resolver if resolver is not None else CIKResolver(downloader=self.downloader)
+        self.ciks = self.resolver.resolve_many(list(CIK_dict) if tickers is None else tickers,
+                                               as_of=f"{year}-12-31")
 
-    def get_master_index(self, form_type="10-K"):
-        """Fetch the SEC master index for the given year and form type."""
-        year_data = []
-        for Q in ['QTR1', 'QTR2', 'QTR3', 'QTR4']:
-            url = f"https://www.sec.gov/Archives/edgar/full-index/{self.year}/{Q}/master.idx"
-            resp = requests.get(url, headers=SEC_HEADERS)
-
-            if resp.status_code == 200:
-                # Always try to decode as text, even if Content-Type is application/octet-stream
-                try:
-                    text = resp.text
-                except UnicodeDecodeError:
-                    # Fallback if .text fails
-                    text = resp.content.decode('latin-1', errors='ignore')
-
-                lines = text.splitlines()
-
-                # Find header row dynamically
-                header_idx = None
-                for i, line in enumerate(lines):
-                    if line.startswith("CIK|Company Name|Form Type|Date Filed|Filename"):
-                        header_idx = i
-                        break
-
-                if header_idx is None:
-                    print(f"⚠️ Could not find header in {Q}")
-                    continue
-
-                data_lines = lines[header_idx + 1:]
-                mydf = pd.DataFrame(
-                    [row.split('|') for row in data_lines if row.strip()],
-                    columns=lines[header_idx].split('|')
-                )
-                year_data.append(mydf)
-            else:
-                print(f"⚠️ Skipping {Q} — got HTTP {resp.status_code}")
-
-            time.sleep(0.5)  # be nice to SEC
-
-        if year_data:
-            df = pd.concat(year_data, ignore_index=True)
-            if form_type:
-                df = df.loc[df['Form Type'] == form_type]
-            self.data = df
-        else:
-            self.data = pd.DataFrame()
+    def get_master_index(self, form_type="10-K", refresh=False):
+        """Load the SEC master index for the given year and form type(s).
 
+        Quarters come from the local Parquet cache (see master_index.py) and are only
+        downloaded when missing, still in progress, or refresh=True. The "/A" amendments
+        of the forms are loaded too; build_url_df(include_amendments=True) selects them.
+        """
+        if isinstance(form_type, str):
+            form_type = [form_type]
+        self.form_types = tuple(form_type) if form_type else None
+        self.data = load_master_index([self.year], form_types=amended(self.form_types) if self.form_types else None,
+                                      downloader=self.downloader, refresh=refresh)
         return self
 
 
     def filter_to_dow_jones(self):
-        """Filter the data to only include companies in CIK_dict."""
+        """Filter the data to only include companies in the fetcher's universe (CIK_dict by default)."""
         if self.data.empty:
             print("⚠️ No SEC data loaded yet.")
             return self
-        cik_values = set(CIK_dict.values())
+        cik_values = set(self.ciks.values())
         self.data = self.data[self.data['CIK'].isin(cik_values)]
         return self
 
-    def build_url_df(self):
-        """Build a DataFrame of tickers and full SEC filing URLs."""
-        url_dict = {"Ticker": [], "URL": []}
-        for ticker, cik in CIK_dict.items():
-            company_data = self.data[self.data['CIK'] == str(cik)]
+    def build_url_df(self, all_filings=False, policy="first", include_amendments=False):
+        """Build a DataFrame of tickers and full SEC filing URLs.
+
+        By default one filing per ticker (the earliest filed); all_filings=True keeps every
+        filing in the loaded index, e.g. all 10-Qs of the year, and policy picks another
+        FilingIndex policy such as "latest" or "latest_per_year". include_amendments also
+        accepts "/A" filings of the loaded forms. Rows also carry the CIK, year, form type,
+        filing date and accession number used by FilingCorpus.
+        """
+        columns = ["Ticker", "URL", "CIK", "Year", "Form Type", "Date Filed", "Accession"]
+        if self.data.empty:
+            return pd.DataFrame(columns=columns)
+        index = FilingIndex(self.data)
+        forms = self.form_types or [f for f in self.data['Form Type'].astype(str).unique() if not f.endswith("/A")]
+        rows = []
+        for ticker, cik in self.ciks.items():
+            company_data = index.filings(cik, forms=forms, include_amendments=include_amendments,
+                                         policy="all" if all_filings else policy)
             if company_data.empty:
                 print(f"⚠️ No filing found for {ticker}")
                 continue
-            filename = company_data.iloc[0]['Filename']
-            url = f"https://www.sec.gov/Archives/{filename}"
-            url_dict['Ticker'].append(ticker)
-            url_dict['URL'].append(url)
-        return pd.DataFrame(url_dict)
+            for _, filing in company_data.iterrows():
+                filename = filing['Filename']
+                rows.append([ticker, self.downloader.url(filename), int(cik), self.year,
+                             filing['Form Type'], filing['Date Filed'], accession_from_filename(filename)])
+        return pd.DataFrame(rows, columns=columns)
 
-    def download_filings(self, url_df):
-        """Download filings from the given URL DataFrame into SEC_FILINGS_PATH."""
+    def download_filings(self, url_df, corpus=None):
+        """Download filings from the given URL DataFrame into SEC_FILINGS_PATH.
+
+        Filings are fetched concurrently within SEC's rate limit, streamed to disk and
+        stored gzip-compressed as {accession}.txt.gz; a rerun after an interruption skips
+        the ones already downloaded. With a FilingCorpus each filing is stored under its
+        (ticker, year, form, accession) path instead, filings already in the corpus are
+        skipped, and the corpus manifest is updated (see FilingCorpus.download).
+        """
+        if corpus is not None:
+            corpus.download(url_df, self.downloader)
+            return
         os.makedirs(SEC_FILINGS_PATH, exist_ok=True)
-        for _, row in url_df.iterrows():
-            ticker = row['Ticker']
-            filing_url = row['URL']
-            try:
-                resp = requests.get(filing_url, headers=SEC_HEADERS)
-                if resp.status_code == 200:
-                    save_path = os.path.join(SEC_FILINGS_PATH, f"{ticker}_10K.txt")
-                    with open(save_path, "w", encoding="utf-8") as f:
-                        f.write(resp.text)
-                    print(f"✅ Saved {ticker} 10-K")
-                else:
-                    print(f"❌ Failed to download {ticker} — HTTP {resp.status_code}")
-            except Exception as e:
-                print(f"⚠️ Error downloading {ticker}: {e}")
-            time.sleep(0.5)  # avoid hammering SEC
+        paths = [os.path.join(SEC_FILINGS_PATH, filing_file_name(accession)) for accession in url_df['Accession']]
 
+        results = self.downloader.download_many(zip(url_df['URL'], paths))
+        saved = {}
+        for (_, row), save_path in zip(url_df.iterrows(), paths):
+            if not results.get(row['URL']):
+                print(f"❌ Failed to download {row['Ticker']}")
+                continue
+            saved[row['Ticker']] = os.path.basename(save_path)
+            print(f"✅ Saved {row['Ticker']} {row.get('Form Type', '10-K')}")
+        # analyze_filings reads the file each ticker points to (text_metrics.get_filing_path)
+        update_latest_filings(saved)
@@ -3,10 +3,21 @@ import re
 import pandas as pd
 import nltk
 import string
+from collections import Counter
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
-from functools import lru_cache
-from config import SEC_FILINGS_PATH
+from functools import lru_cache, partial
+import hashlib
+from config import SEC_FILINGS_PATH, TEXT_METRICS_CHUNK_SIZE, TEXT_METRICS_TOKENIZER
+from metrics_cache import MetricsCache
+from edgar_parser import PrimaryDocumentReader
+from filing_storage import open_filing, latest_filings
+from cik_resolver import get_resolver
+from lm_lexicon import LMLexicon, LM_CATEGORY_FILES, REFERENCE_DIR, check_categories
+from filing_sections import ITEM_NAMES, find_item_spans, normalize_items
+from utils.syllable_table import SyllableTable, load_syllable_table
 
 import time
 
@@ -23,8 +34,27 @@ for resource in ['punkt_tab', 'punkt', 'cmudict']:
 stop_words = set(stopwords.words('english'))
 lemma = WordNetLemmatizer()
 
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Fast tokenizer backend: words (keeping "1,234.5", "u.s", "risk-free" whole),
+# runs of sentence-ending punctuation, and any other single symbol
+REGEX_TOKEN_RE = re.compile(r"\w+(?:[.,'\-]\w+)*|[.!?]+|[^\w\s]")
+TOKENIZERS = ("punkt", "regex")
+
+# Bump whenever a scoring change alters the numbers, so cached metrics are recomputed
+METRICS_VERSION = 1
+
+# Per-process resources, populated once by _init_worker in each pool worker
+_worker_resources = None
+
 def make_numsyllables(pronouncing_dict):
-    """Return a cached syllable-counting function bound to a specific pronouncing_dict."""
+    """Return a cached syllable-counting function bound to a specific pronouncing_dict.
+
+    pronouncing_dict may be a cmudict-style dict or a precompiled SyllableTable.
+    """
+    if isinstance(pronouncing_dict, SyllableTable):
+        return lru_cache(maxsize=None)(pronouncing_dict.get)
+
     @lru_cache(maxsize=None)
     def _numsyllables(word):
         try:
@@ -34,36 +64,399 @@ def make_numsyllables(pronouncing_dict):
             return 0
     return _numsyllables
 
-def load_lm_dict(filename):
-    """Load an LM dictionary file from data/reference/."""
-    path = os.path.join("data", "reference", filename)
-    with open(path, encoding="utf-8") as f:
-        return set(nltk.tokenize.word_tokenize(f.read().lower()))
+def lexicon_fingerprint():
+    """SHA-256 of each available LM dictionary file, keyed by file name."""
+    fingerprint = {}
+    for filename in LM_CATEGORY_FILES.values():
+        path = os.path.join(REFERENCE_DIR, filename)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                fingerprint[filename] = hashlib.sha256(f.read()).hexdigest()
+    return fingerprint
+
+def load_resources(pronouncing_dict):
+    """Load the LM dictionaries, stopwords, lemmatizer and syllable function used for scoring."""
+    # WordNet is loaded lazily on first use; warm it up so that cost is paid here, not per filing
+    lemma.lemmatize("filings")
+    return {
+        "numsyllables_fn": make_numsyllables(pronouncing_dict),
+        "lemmatize_fn": lru_cache(maxsize=None)(lemma.lemmatize),
+        "stop_words": stop_words,
+        "lexicon": LMLexicon(),
+    }
+
+def _init_worker(pronouncing_dict):
+    """Process-pool initializer: load the scoring resources once per worker."""
+    global _worker_resources
+    _worker_resources = load_resources(pronouncing_dict)
+
+def _run_in_worker(score_fn, ticker, **options):
+    return score_fn(ticker, _worker_resources, **options)
+
+def _as_frequencies(tokens):
+    """Accept either a token list or a {token: count} table; return the table."""
+    return tokens if isinstance(tokens, Mapping) else Counter(tokens)
+
+def _as_count(sentences):
+    """Accept either a sentence list or a sentence count; return the count."""
+    return sentences if isinstance(sentences, int) else len(sentences)
 
 def fog_index(tokens, sentences, numsyllables_fn):
-    N_words = len(tokens)
-    N_sents = len(sentences)
-    doc_nonstopwords = [t for t in tokens if t not in stop_words]
-    N_nonstopwords = len(doc_nonstopwords)
-    complexwords = [w for w in doc_nonstopwords if numsyllables_fn(w) > 2]
-    N_complex = len(complexwords)
+    """FOG index from a token list or token-frequency table and a sentence list or count."""
+    freq = _as_frequencies(tokens)
+    N_words = sum(freq.values())
+    N_sents = _as_count(sentences)
+    N_nonstopwords = 0
+    N_complex = 0
+    for w, n in freq.items():
+        if w in stop_words:
+            continue
+        N_nonstopwords += n
+        if numsyllables_fn(w) > 2:
+            N_complex += n
     return 0.4 * ((N_words / N_sents) + (N_complex / N_nonstopwords)) if N_sents and N_nonstopwords else 0
 
 def flesch_reading_ease(tokens, sentences, numsyllables_fn):
-    nopunctuation = [t for t in tokens if t not in string.punctuation]
-    total_words = len(nopunctuation)
-    total_sentences = len(sentences)
-    total_syllables = sum(numsyllables_fn(w) for w in tokens)
+    """Flesch Reading Ease from a token list or token-frequency table and a sentence list or count."""
+    freq = _as_frequencies(tokens)
+    total_words = sum(n for t, n in freq.items() if t not in string.punctuation)
+    total_sentences = _as_count(sentences)
+    total_syllables = sum(numsyllables_fn(w) * n for w, n in freq.items())
     return 206.835 - 1.015 * (total_words / total_sentences) - 84.6 * (total_syllables / total_words) if total_sentences and total_words else 0
 
-def analyze_filings(tickers, pronouncing_dict):
-    """Run Uncertainty, Tone, FOG, and Flesch in one pass per filing."""
-    numsyllables_fn = make_numsyllables(pronouncing_dict)
+def iter_clean_chunks(f, chunk_size=TEXT_METRICS_CHUNK_SIZE):
+    """Yield lowercase, tag-stripped text from an open file, chunk_size characters at a time.
+
+    A tag cut by a chunk boundary is carried into the next chunk. An unclosed '<' is only
+    carried for one chunk's worth of text before it is treated as a literal character.
+    """
+    carry = ""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        text = carry + chunk
+        carry = ""
+        lt = text.rfind('<')
+        if lt > text.rfind('>') and len(text) - lt <= chunk_size:
+            text, carry = text[:lt], text[lt:]
+        yield TAG_RE.sub(' ', text.lower())
+    if carry:
+        yield carry.lower()
+
+def _regex_sentence_count(freq, last_token):
+    """Sentences in regex-tokenized text: ending-punctuation runs plus any unterminated tail."""
+    n_ends = sum(n for t, n in freq.items() if t[0] in ".!?")
+    return n_ends + (last_token is not None and last_token[0] not in ".!?")
+
+def tokenize(clean_text, tokenizer=TEXT_METRICS_TOKENIZER):
+    """Return (tokens, n_sentences) for already-cleaned text.
+
+    tokenizer="punkt" uses nltk word_tokenize/sent_tokenize. tokenizer="regex" finds words
+    and sentence boundaries in a single compiled-regex pass: much faster, slightly
+    different counts (see compare_tokenizers).
+    """
+    if tokenizer == "punkt":
+        return nltk.tokenize.word_tokenize(clean_text), len(nltk.tokenize.sent_tokenize(clean_text))
+    if tokenizer == "regex":
+        tokens = REGEX_TOKEN_RE.findall(clean_text)
+        return tokens, _regex_sentence_count(Counter(tokens), tokens[-1] if tokens else None)
+    raise ValueError(f"Unknown tokenizer {tokenizer!r}; expected one of {TOKENIZERS}")
+
+def iter_sentence_tokens(chunks, chunk_size=TEXT_METRICS_CHUNK_SIZE, tokenizer=TEXT_METRICS_TOKENIZER):
+    """Yield (tokens, n_sentences) batches from a stream of clean text chunks.
+
+    punkt: one batch per sentence. The last, possibly incomplete, sentence of each chunk
+    is held back and prefixed to the next one. If it grows past chunk_size without a
+    sentence boundary, everything up to its last whitespace is emitted as a fragment
+    (n_sentences=0).
+    regex: one batch per chunk, cut at the last whitespace; sentence ends are counted
+    as they are seen and an unterminated tail counts once at the end.
+    """
+    if tokenizer == "regex":
+        yield from _iter_regex_tokens(chunks, chunk_size)
+        return
+    if tokenizer != "punkt":
+        raise ValueError(f"Unknown tokenizer {tokenizer!r}; expected one of {TOKENIZERS}")
+
+    pending = ""
+    for chunk in chunks:
+        text = pending + chunk
+        sentences = nltk.tokenize.sent_tokenize(text)
+        if not sentences:
+            pending = ""
+            continue
+        # Keep the raw tail (with its trailing whitespace) so the next chunk joins correctly
+        pending = text[text.rfind(sentences.pop()):]
+        for sent in sentences:
+            yield nltk.tokenize.word_tokenize(sent, preserve_line=True), 1
+        if len(pending) > chunk_size:
+            cut = max(pending.rfind(' '), 0)
+            yield nltk.tokenize.word_tokenize(pending[:cut], preserve_line=True), 0
+            pending = pending[cut:]
+    if pending.strip():
+        yield nltk.tokenize.word_tokenize(pending, preserve_line=True), 1
+
+def _iter_regex_tokens(chunks, chunk_size):
+    pending = ""
+    last_token = None
+    for chunk in chunks:
+        text = pending + chunk
+        cut = max(text.rfind(' '), text.rfind('\n'), text.rfind('\t'))
+        if cut < 0 and len(text) <= chunk_size:
+            pending = text
+            continue
+        if cut < 0:
+            cut = len(text)
+        text, pending = text[:cut], text[cut:]
+        tokens = REGEX_TOKEN_RE.findall(text)
+        if tokens:
+            last_token = tokens[-1]
+            yield tokens, sum(1 for t in tokens if t[0] in ".!?")
+    tokens = REGEX_TOKEN_RE.findall(pending)
+    if tokens:
+        last_token = tokens[-1]
+    yield tokens, int(last_token is not None and last_token[0] not in ".!?")
+
+def count_phrases(tokens, resources, counts=None):
+    """Count the lexicon's multi-word entries in a token sequence (lemmatized alphabetic tokens)."""
+    lexicon = resources["lexicon"]
+    if not lexicon.has_phrases:
+        return counts
+    lemmatize_fn = resources["lemmatize_fn"]
+    return lexicon.count_phrases((lemmatize_fn(t) for t in tokens if t.isalpha()), counts)
+
+def score_frequencies(freq, n_sentences, resources, categories=(), phrase_counts=None):
+    """Compute Uncertainty, Tone, FOG and Readability from a token-frequency table.
+
+    Each distinct token is lemmatized and looked up once in the compiled LM lexicon,
+    whose category bitmask updates every category count in the same pass; counts are
+    weighted by token frequency. phrase_counts adds multi-word matches found by
+    count_phrases. Each LM category in categories adds a column with its share of
+    lemmawords.
+    """
+    lexicon = resources["lexicon"]
+    lemmatize_fn = resources["lemmatize_fn"]
+    counts = dict.fromkeys(lexicon.categories, 0)
+    n_lemmas = 0
+    for t, n in freq.items():
+        if t in resources["stop_words"] or not t.isalpha():
+            continue
+        n_lemmas += n
+        mask = lexicon.mask(lemmatize_fn(t))
+        if mask:
+            lexicon.add_counts(counts, mask, n)
+    for category, n in (phrase_counts or {}).items():
+        counts[category] += n
+
+    # Uncertainty: proportion of lemmawords in the Uncertainty list
+    uncertainty_score = counts.get("Uncertainty", 0) / n_lemmas if n_lemmas else 0
+
+    # Tone: (positive - negative) / total sentiment words
+    pos_count = counts.get("Positive", 0)
+    neg_count = counts.get("Negative", 0)
+    total_sentiment = pos_count + neg_count
+    tone_score = ((pos_count - neg_count) / total_sentiment) if total_sentiment else 0
+
+    scores = {
+        "Uncertainty": uncertainty_score,
+        "Tone": tone_score,
+        "FOG": fog_index(freq, n_sentences, resources["numsyllables_fn"]),
+        "Readability": flesch_reading_ease(freq, n_sentences, resources["numsyllables_fn"]),
+    }
+    for category in categories:
+        scores.setdefault(category, counts.get(category, 0) / n_lemmas if n_lemmas else 0)
+    return scores
+
+def _open_text(f, primary_only):
+    """Wrap an open submission so reads return only its primary document when requested."""
+    return PrimaryDocumentReader(f) if primary_only else f
+
+def _score_stream(filing_path, resources, chunk_size, primary_only, tokenizer, categories):
+    """Score a filing in bounded memory: read, strip and tokenize chunk by chunk.
+
+    Only the token-frequency table and a sentence count are kept, so memory is bounded
+    by the vocabulary rather than the size of the file.
+    """
+    freq = Counter()
+    n_sentences = 0
+    phrase_counts = None
+    with open_filing(filing_path) as f:
+        chunks = iter_clean_chunks(_open_text(f, primary_only), chunk_size)
+        for tokens, n in iter_sentence_tokens(chunks, chunk_size, tokenizer):
+            n_sentences += n
+            freq.update(tokens)
+            phrase_counts = count_phrases(tokens, resources, phrase_counts)
+    return score_frequencies(freq, n_sentences, resources, categories, phrase_counts)
+
+def read_clean_text(filing_path, primary_only=True):
+    """Read a filing and return its lowercase, tag-stripped text."""
+    with open_filing(filing_path) as f:
+        return TAG_RE.sub(' ', _open_text(f, primary_only).read().lower())
+
+def filing_tokens(filing_path, primary_only=True, tokenizer=TEXT_METRICS_TOKENIZER):
+    """The cleaned tokens analyze_filings scores for a filing, in document order."""
+    tokens, _ = tokenize(read_clean_text(filing_path, primary_only), tokenizer)
+    return tokens
+
+def _find_filing(ticker, latest):
+    if ticker in latest:
+        return os.path.join(SEC_FILINGS_PATH, latest[ticker])
+    path = os.path.join(SEC_FILINGS_PATH, f"{ticker}_10K.txt")
+    return path if os.path.exists(path) else None
+
+def get_filing_path(ticker):
+    """Local path of a ticker's downloaded 10-K: the latest {accession}.txt.gz, else a legacy {ticker}_10K.txt.
+
+    If nothing is stored under ticker, filings saved under another ticker of the same
+    company (e.g. "UTX" for "RTX", see cik_resolver.py) are used.
+    """
+    latest = latest_filings(SEC_FILINGS_PATH)
+    path = _find_filing(ticker, latest)
+    if path is None:
+        for alias in get_resolver().aliases(ticker):
+            path = _find_filing(alias, latest)
+            if path is not None:
+                break
+    return path or os.path.join(SEC_FILINGS_PATH, f"{ticker}_10K.txt")
+
+def score_filing(ticker, resources, stream=False, chunk_size=TEXT_METRICS_CHUNK_SIZE, primary_only=True,
+                 tokenizer=TEXT_METRICS_TOKENIZER, categories=(), filing_path=None):
+    """Score one ticker's 10-K; return a metrics row, or None if the file is missing.
+
+    With primary_only=True only the main 10-K document of the EDGAR submission is
+    scored; exhibits, XBRL and encoded attachments are skipped (see edgar_parser.py).
+    With stream=True the file is processed chunk by chunk and only the token-frequency
+    table is kept, so peak memory does not grow with the size of the submission.
+    tokenizer selects the "punkt" or "regex" backend (see tokenize); categories adds
+    extra LM category columns (see score_frequencies). filing_path overrides the default
+    location from get_filing_path (e.g. a FilingCorpus entry); .gz files are decompressed
+    on the fly.
+    """
+    t0 = time.time()
+    if filing_path is None:
+        filing_path = get_filing_path(ticker)
+    if not os.path.exists(filing_path):
+        print(f"⚠️ Missing 10-K for {ticker}")
+        return None
+
+    if stream:
+        row = {"Ticker": ticker, **_score_stream(filing_path, resources, chunk_size, primary_only, tokenizer, categories)}
+        print(f"{ticker} - Streamed scoring: {time.time() - t0:.2f}s")
+        return row
+
+    with open_filing(filing_path) as f:
+        raw_text = _open_text(f, primary_only).read()
+    print(f"{ticker} - Read file: {time.time() - t0:.2f}s")
+
+    # Clean HTML tags
+    t1 = time.time()
+    clean_text = re.sub(r'<[^>]+>', ' ', raw_text.lower())
+    print(f"{ticker} - HTML strip: {time.time() - t1:.2f}s")
+
+    # Tokenize
+    t2 = time.time()
+    tokens, n_sentences = tokenize(clean_text, tokenizer)
+    print(f"{ticker} - Tokenization: {time.time() - t2:.2f}s")
+
+    # Frequency table + stopword removal, lemmatization and scoring per distinct token
+    t3 = time.time()
+    scores = score_frequencies(Counter(tokens), n_sentences, resources, categories,
+                               count_phrases(tokens, resources))
+    print(f"{ticker} - Frequency table + scoring: {time.time() - t3:.2f}s")
+
+    return {"Ticker": ticker, **scores}
+
+def score_text(clean_text, resources, tokenizer=TEXT_METRICS_TOKENIZER, categories=()):
+    """Tokenize already-cleaned text and return its Uncertainty, Tone, FOG and Readability."""
+    tokens, n_sentences = tokenize(clean_text, tokenizer)
+    return score_frequencies(Counter(tokens), n_sentences, resources, categories,
+                             count_phrases(tokens, resources))
+
+def score_sections(ticker, resources, sections=("1A", "7"), primary_only=True, tokenizer=TEXT_METRICS_TOKENIZER,
+                   categories=()):
+    """Score selected 10-K Items of one ticker's filing; return a list of rows, or None if missing.
+
+    Item boundaries are found in one pass over the cleaned text and only the selected
+    sections are tokenized. Items that cannot be located are reported and skipped.
+    """
+    t0 = time.time()
+    filing_path = get_filing_path(ticker)
+    if not os.path.exists(filing_path):
+        print(f"⚠️ Missing 10-K for {ticker}")
+        return None
+
+    clean_text = read_clean_text(filing_path, primary_only)
+    spans = find_item_spans(clean_text)
+
+    rows = []
+    for item in sections:
+        if item not in spans:
+            print(f"⚠️ Item {item} not found for {ticker}")
+            continue
+        start, end = spans[item]
+        rows.append({"Ticker": ticker, "Section": item, **score_text(clean_text[start:end], resources, tokenizer, categories)})
+    print(f"{ticker} - Section scoring: {time.time() - t0:.2f}s")
+    return rows
+
+def _score_filings(tickers, pronouncing_dict, workers, options, score_fn=score_filing):
+    """Apply score_fn serially or in a process pool; results (or None) come back in ticker order."""
+    if workers is None or workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(pronouncing_dict,)) as pool:
+            return list(pool.map(partial(_run_in_worker, score_fn, **options), tickers))
 
     # Load LM dictionaries once
-    uncertainty_set = load_lm_dict("LM_Uncertainty.txt")
-    positive_set    = load_lm_dict("LM_Positive.txt")
-    negative_set    = load_lm_dict("LM_Negative.txt")
+    resources = load_resources(pronouncing_dict)
+    return [score_fn(ticker, resources, **options) for ticker in tickers]
+
+def analyze_filings(tickers, pronouncing_dict=None, workers=1, stream=False, chunk_size=TEXT_METRICS_CHUNK_SIZE,
+                    primary_only=True, tokenizer=TEXT_METRICS_TOKENIZER, categories=(), cache=None,
+                    force_refresh=False):
+    """Run Uncertainty, Tone, FOG, and Flesch in one pass per filing.
+
+    pronouncing_dict defaults to the precompiled syllable table (see utils/syllable_table.py).
+    With workers > 1 (or None for every core) filings are scored in a process pool whose
+    workers each load the scoring resources once; rows come back in ticker order.
+    With stream=True each filing is read in chunk_size pieces to keep memory flat.
+    primary_only=False scores the whole submission, exhibits included, as before.
+    tokenizer picks the "punkt" (fidelity) or "regex" (speed) backend.
+    categories adds a column per extra LM category (e.g. "Litigious", "WeakModal") holding
+    its share of lemmawords; all categories are counted in the same single pass. A category
+    without a word list in data/reference/ raises FileNotFoundError.
+
+    cache may be True (default store) or a MetricsCache. Filings whose contents, LM
+    dictionaries, METRICS_VERSION and options are unchanged are served from the store and
+    only the rest are scored; force_refresh rescores everything. With a cache the result
+    gains a boolean CacheHit column.
+    """
+    if pronouncing_dict is None:
+        pronouncing_dict = load_syllable_table()
+    if cache is True:
+        cache = MetricsCache()
+
+    categories = tuple(c for c in categories if c != "Uncertainty")
+    check_categories(categories)
+    options = {"stream": stream, "chunk_size": chunk_size, "primary_only": primary_only, "tokenizer": tokenizer,
+               "categories": categories}
+    keys = {}
+    cached = {}
+    if cache:
+        fingerprint = {"version": METRICS_VERSION, "lexicons": lexicon_fingerprint(),
+                       "stream": stream, "chunk_size": chunk_size if stream else None,
+                       "primary_only": primary_only, "tokenizer": tokenizer, "categories": sorted(categories)}
+        for ticker in tickers:
+            if os.path.exists(get_filing_path(ticker)):
+                keys[ticker] = MetricsCache.key(get_filing_path(ticker), fingerprint)
+        if not force_refresh:
+            stored = cache.get_many(key for key, _ in keys.values())
+            cached = {t: {"Ticker": t, **stored[k]} for t, (k, _) in keys.items() if k in stored}
+            print(f"♻️ {len(cached)} of {len(tickers)} filings served from metrics cache")
+
+    to_score = [t for t in tickers if t not in cached]
+    scored = dict(zip(to_score, _score_filings(to_score, pronouncing_dict, workers, options)))
+    if cache:
+        cache.put_many([(*keys[t], row) for t, row in scored.items() if row is not None and t in keys])
 
     results = {
         "Ticker": [],
@@ -72,57 +465,64 @@ def analyze_filings(tickers, pronouncing_dict):
         "FOG": [],
         "Readability": []
     }
-
+    for category in categories:
+        results[category] = []
+    columns = list(results)
+    if cache:
+        results["CacheHit"] = []
     for ticker in tickers:
-        t0 = time.time()
-        filing_path = os.path.join(SEC_FILINGS_PATH, f"{ticker}_10K.txt")
-        if not os.path.exists(filing_path):
-            print(f"⚠️ Missing 10-K for {ticker}")
+        row = cached.get(ticker) or scored.get(ticker)
+        if row is None:
             continue
-
-        with open(filing_path, encoding="utf-8") as f:
-            raw_text = f.read()
-        print(f"{ticker} - Read file: {time.time() - t0:.2f}s")
-
-        # Clean HTML tags
-        t1 = time.time()
-        clean_text = re.sub(r'<[^>]+>', ' ', raw_text.lower())
-        print(f"{ticker} - HTML strip: {time.time() - t1:.2f}s")
-
-        # Tokenize
-        t2 = time.time()
-        tokens = nltk.tokenize.word_tokenize(clean_text)
-        sentences = nltk.tokenize.sent_tokenize(clean_text)
-        print(f"{ticker} - Tokenization: {time.time() - t2:.2f}s")
-
-        # Stopword removal + lemmatization
-        t3 = time.time()
-        nonstop = [t for t in tokens if t not in stop_words and t.isalpha()]
-        lemmawords = [lemma.lemmatize(t) for t in nonstop]
-        print(f"{ticker} - Stopword removal + lemmatization: {time.time() - t3:.2f}s")
-
-        # --- Metric calculations ---
-        # Uncertainty: proportion of lemmawords in uncertainty_set
-        uncertainty_count = sum(1 for w in lemmawords if w in uncertainty_set)
-        uncertainty_score = uncertainty_count / len(lemmawords) if lemmawords else 0
-
-        # Tone: (positive - negative) / total sentiment words
-        pos_count = sum(1 for w in lemmawords if w in positive_set)
-        neg_count = sum(1 for w in lemmawords if w in negative_set)
-        total_sentiment = pos_count + neg_count
-        tone_score = ((pos_count - neg_count) / total_sentiment) if total_sentiment else 0
-
-        # FOG index
-        fog_score = fog_index(tokens, sentences, numsyllables_fn)
-
-        # Flesch Reading Ease
-        readability_score = flesch_reading_ease(tokens, sentences, numsyllables_fn)
-
-        # Append to results
-        results["Ticker"].append(ticker)
-        results["Uncertainty"].append(uncertainty_score)
-        results["Tone"].append(tone_score)
-        results["FOG"].append(fog_score)
-        results["Readability"].append(readability_score)
+        for col in columns:
+            results[col].append(row[col])
+        if cache:
+            results["CacheHit"].append(ticker in cached)
 
     return pd.DataFrame(results)
+
+def analyze_sections(tickers, sections=("1A", "7"), pronouncing_dict=None, workers=1, primary_only=True,
+                     tokenizer=TEXT_METRICS_TOKENIZER, categories=()):
+    """Run Uncertainty, Tone, FOG, and Flesch per 10-K Item (e.g. "1A" Risk Factors, "7" MD&A).
+
+    Returns a long-format DataFrame with one row per (Ticker, Section). Only the
+    requested sections are tokenized, so a risk-only job skips the rest of the filing.
+    """
+    if pronouncing_dict is None:
+        pronouncing_dict = load_syllable_table()
+    categories = tuple(c for c in categories if c != "Uncertainty")
+    check_categories(categories)
+    options = {"sections": normalize_items(sections), "primary_only": primary_only, "tokenizer": tokenizer,
+               "categories": categories}
+    per_ticker = _score_filings(tickers, pronouncing_dict, workers, options, score_fn=score_sections)
+
+    rows = [row for ticker_rows in per_ticker if ticker_rows for row in ticker_rows]
+    df = pd.DataFrame(rows, columns=["Ticker", "Section", "Uncertainty", "Tone", "FOG", "Readability", *categories])
+    df.insert(2, "Section Name", df["Section"].map(ITEM_NAMES))
+    return df
+
+def compare_tokenizers(tickers, pronouncing_dict=None, workers=1, primary_only=True):
+    """Score the same filings with both tokenizer backends and report how FOG and Flesch differ.
+
+    Returns one row per ticker with each backend's FOG and Readability and the
+    regex-minus-punkt differences; a corpus-level summary and timings are printed.
+    """
+    if pronouncing_dict is None:
+        pronouncing_dict = load_syllable_table()
+
+    frames = {}
+    for tokenizer in TOKENIZERS:
+        t0 = time.time()
+        frames[tokenizer] = analyze_filings(tickers, pronouncing_dict, workers=workers,
+                                            primary_only=primary_only, tokenizer=tokenizer)
+        print(f"⏱ {tokenizer} backend: {time.time() - t0:.2f}s for {len(frames[tokenizer])} filings")
+
+    cols = ["Ticker", "FOG", "Readability"]
+    df = frames["punkt"][cols].merge(frames["regex"][cols], on="Ticker", suffixes=("_punkt", "_regex"))
+    for metric in ["FOG", "Readability"]:
+        df[f"{metric}_diff"] = df[f"{metric}_regex"] - df[f"{metric}_punkt"]
+        df[f"{metric}_pct_diff"] = df[f"{metric}_diff"] / df[f"{metric}_punkt"].abs() * 100
+        print(f"📏 {metric}: mean |diff| = {df[f'{metric}_diff'].abs().mean():.3f}, "
+              f"max |diff| = {df[f'{metric}_diff'].abs().max():.3f}, "
+              f"mean |pct diff| = {df[f'{metric}_pct_diff'].abs().mean():.2f}%")
+    return df
@@ -0,0 +1,267 @@
+import io
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+from collections import Counter
+from config import BENCHMARK_PATH, TEXT_METRICS_TOKENIZER
+from edgar_parser import PrimaryDocumentReader
+from filing_storage import open_filing
+from lm_lexicon import LMLexicon
+from text_metrics import TAG_RE, tokenize, load_resources, count_phrases, score_frequencies
+from filing_sections import find_item_spans
+
+# Plain English filler mixed with the LM word lists so lexicon hit rates look like a real 10-K
+COMMON_WORDS = (
+    "the of and to in a for our we is on that by or with as are be from this which our its "
+    "company business net sales revenue income operating results financial year fiscal million "
+    "billion percent increase decrease compared primarily due products services customers market "
+    "markets segment segments cash flows capital expenditures debt interest rate rates tax taxes "
+    "assets liabilities equity shareholders stock shares common quarter period periods total "
+    "costs expenses research development marketing general administrative management report "
+    "accounting standards statements consolidated notes fair value investments securities "
+    "credit facility agreement agreements operations international domestic foreign currency "
+    "exchange supply chain manufacturing distribution employees regulatory government laws "
+    "regulations compliance risk factors competition competitive pricing demand growth"
+).split()
+
+HTML_OPEN = ('<p style="margin:0pt"><font style="font-family:Times New Roman;font-size:10pt">', '<div><span>',
+             '<td style="padding:0 4pt" valign="top"><p>')
+HTML_CLOSE = ('</font></p>', '</span></div>', '</p></td>')
+
+ITEMS = ("1", "1A", "1B", "2", "3", "4", "5", "7", "7A", "8", "9", "9A", "10", "15")
+
+
+def _vocabulary(reference_dir=None):
+    """Common words plus every single-word LM entry that is available, lowercased."""
+    lexicon = LMLexicon() if reference_dir is None else LMLexicon(reference_dir=reference_dir)
+    return COMMON_WORDS + sorted(lexicon.word_masks)
+
+
+def _paragraph(rng, vocab, weights, n_words):
+    words = rng.choice(vocab, size=n_words, p=weights)
+    # Sentences of 8-30 words, a sprinkling of numbers
+    out, i = [], 0
+    while i < n_words:
+        n = int(rng.integers(8, 31))
+        sentence = list(words[i:i + n])
+        if rng.random() < 0.3:
+            sentence.insert(int(rng.integers(0, len(sentence) + 1)), f"${rng.integers(1, 999)},{rng.integers(100, 999)}")
+        out.append(" ".join(sentence).capitalize() + ".")
+        i += n
+    k = int(rng.integers(len(HTML_OPEN)))
+    return HTML_OPEN[k] + " ".join(out) + HTML_CLOSE[k] + "\n"
+
+
+def _uuencoded_block(rng, n_bytes):
+    lines = ["begin 644 graphic.jpg"]
+    alphabet = np.frombuffer(b"!\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_", dtype=np.uint8)
+    for _ in range(max(1, n_bytes // 61)):
+        lines.append("M" + rng.choice(alphabet, size=60).tobytes().decode("ascii"))
+    lines += ["`", "end"]
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_10k(size_mb=5.0, seed=0, primary_share=0.6, vocab=None):
+    """
+    Generate an EDGAR-style 10-K submission of about size_mb megabytes.
+
+    The primary 10-K document holds about primary_share of the bytes as HTML paragraphs
+    under Item headings, wrapped in <XBRL> like an inline-XBRL filing, with words drawn
+    from a Zipf-weighted vocabulary of common filing words and LM lexicon entries. The
+    rest is split between an exhibit, a uuencoded graphic and an XBRL instance, which
+    the primary-document reader skips.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.array(vocab if vocab is not None else _vocabulary())
+    # Zipf-like weights over a shuffled vocabulary
+    weights = 1.0 / np.arange(1, len(vocab) + 1) ** 1.1
+    weights = rng.permutation(weights / weights.sum())
+
+    target = int(size_mb * (1 << 20))
+    primary_target = int(target * primary_share)
+    other_target = (target - primary_target) // 3
+
+    def body(n_bytes, items=()):
+        # Item headings are spread evenly through the document
+        parts, n = [], 0
+        items = list(items)
+        every = n_bytes // len(items) if items else None
+        while n < n_bytes:
+            if items and n >= every * (len(ITEMS) - len(items)):
+                heading = f'<p><b>Item&nbsp;{items.pop(0)}.</b></p>\n'
+                parts.append(heading)
+                n += len(heading)
+            p = _paragraph(rng, vocab, weights, int(rng.integers(60, 250)))
+            parts.append(p)
+            n += len(p)
+        return "".join(parts)
+
+    return "".join([
+        "<SEC-DOCUMENT>0000000000-00-000000.txt : 20240101\n",
+        "<SEC-HEADER>0000000000-00-000000.hdr.sgml : 20240101\n",
+        "CONFORMED SUBMISSION TYPE:\t10-K\nCOMPANY CONFORMED NAME:\t\tSYNTHETIC CORP\n</SEC-HEADER>\n",
+        "<DOCUMENT>\n<TYPE>10-K\n<SEQUENCE>1\n<FILENAME>synthetic-10k.htm\n<TEXT>\n<XBRL>\n<html><body>\n",
+        body(primary_target, ITEMS),
+        "</body></html>\n</XBRL>\n</TEXT>\n</DOCUMENT>\n",
+        "<DOCUMENT>\n<TYPE>EX-21\n<SEQUENCE>2\n<FILENAME>ex21.htm\n<TEXT>\n",
+        body(other_target),
+        "</TEXT>\n</DOCUMENT>\n",
+        "<DOCUMENT>\n<TYPE>GRAPHIC\n<SEQUENCE>3\n<FILENAME>graphic.jpg\n<TEXT>\n",
+        _uuencoded_block(rng, other_target),
+        "</TEXT>\n</DOCUMENT>\n",
+        "<DOCUMENT>\n<TYPE>EX-101.INS\n<SEQUENCE>4\n<FILENAME>syn-20231231.xml\n<TEXT>\n<XBRL>\n",
+        '<us-gaap:Revenues contextRef="FY2023" unitRef="usd" decimals="-6">1000000</us-gaap:Revenues>\n'
+        * max(1, other_target // 90),
+        "</XBRL>\n</TEXT>\n</DOCUMENT>\n</SEC-DOCUMENT>\n",
+    ])
+
+
+def write_synthetic_10k(path, size_mb=5.0, seed=0):
+    """Write a synthetic submission to path and return the path."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(synthetic_10k(size_mb, seed))
+    return path
+
+
+def _measure(fn, repeats):
+    """Best wall time over repeats, then one more run under tracemalloc for peak memory."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(filing_path=None, size_mb=5.0, tokenizers=(TEXT_METRICS_TOKENIZER,), repeats=3,
+                  pronouncing_dict=None, seed=0):
+    """
+    Time each text_metrics stage on one filing (a synthetic one by default).
+
+    Stages: read (decompress and decode the file), strip (primary document + lowercase + tag removal),
+    sections (Item headings), tokenize, lemmatize (distinct words, cold cache) and score
+    (lexicon, phrases, FOG and readability). Returns a dict with per-stage seconds, MB/s,
+    tokens/s and tracemalloc peak MB, ready to be dumped as JSON. On the synthetic filing
+    every Item in ITEMS must be found, or ValueError is raised.
+    """
+    synthetic = filing_path is None
+    if synthetic:
+        filing_path = write_synthetic_10k(os.path.join(BENCHMARK_PATH, f"synthetic_{size_mb:g}mb_{seed}.txt"),
+                                          size_mb, seed)
+    if pronouncing_dict is None:
+        from utils.syllable_table import load_syllable_table
+        pronouncing_dict = load_syllable_table()
+    resources = load_resources(pronouncing_dict)
+    n_bytes = os.path.getsize(filing_path)
+
+    def read():
+        with open_filing(filing_path) as f:
+            return f.read()
+
+    raw, seconds, peak = _measure(read, repeats)
+    results = [{"stage": "read", "tokenizer": None, "seconds": seconds, "input_bytes": n_bytes,
+                "tokens": None, "peak_mb": peak / 1e6}]
+
+    def strip():
+        return TAG_RE.sub(' ', PrimaryDocumentReader(io.StringIO(raw)).read().lower())
+
+    clean, seconds, peak = _measure(strip, repeats)
+    results.append({"stage": "strip", "tokenizer": None, "seconds": seconds, "input_bytes": n_bytes,
+                    "tokens": None, "peak_mb": peak / 1e6})
+    del raw
+
+    spans, seconds, peak = _measure(lambda: find_item_spans(clean), repeats)
+    results.append({"stage": "sections", "tokenizer": None, "seconds": seconds,
+                    "input_bytes": len(clean.encode("utf-8")), "tokens": None, "peak_mb": peak / 1e6})
+    missing = [item for item in ITEMS if item not in spans]
+    if synthetic and missing:
+        raise ValueError(f"Item headings not found in the synthetic filing: {', '.join(missing)}")
+
+    for tokenizer in tokenizers:
+        (tokens, n_sentences), seconds, peak = _measure(lambda: tokenize(clean, tokenizer), repeats)
+        results.append({"stage": "tokenize", "tokenizer": tokenizer, "seconds": seconds,
+                        "input_bytes": len(clean.encode("utf-8")), "tokens": len(tokens), "peak_mb": peak / 1e6})
+
+        freq = Counter(tokens)
+        words = [t for t in freq if t.isalpha() and t not in resources["stop_words"]]
+
+        def lemmatize():
+            resources["lemmatize_fn"].cache_clear()
+            return [resources["lemmatize_fn"](w) for w in words]
+
+        _, seconds, peak = _measure(lemmatize, repeats)
+        results.append({"stage": "lemmatize", "tokenizer": tokenizer, "seconds": seconds,
+                        "input_bytes": None, "tokens": len(words), "peak_mb": peak / 1e6})
+
+        def score():
+            return score_frequencies(Counter(tokens), n_sentences, resources,
+                                     phrase_counts=count_phrases(tokens, resources))
+
+        _, seconds, peak = _measure(score, repeats)
+        results.append({"stage": "score", "tokenizer": tokenizer, "seconds": seconds,
+                        "input_bytes": None, "tokens": len(tokens), "peak_mb": peak / 1e6})
+
+    for r in results:
+        r["mb_per_s"] = r["input_bytes"] / 1e6 / r["seconds"] if r["input_bytes"] and r["seconds"] else None
+        r["tokens_per_s"] = r["tokens"] / r["seconds"] if r["tokens"] and r["seconds"] else None
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "filing": filing_path,
+        "filing_bytes": n_bytes,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def save_benchmark(report, path=None):
+    """Write a run_benchmark report as JSON (default: BENCHMARK_PATH/benchmark_<commit>.json)."""
+    if path is None:
+        path = os.path.join(BENCHMARK_PATH, f"benchmark_{report['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Saved benchmark results to {path}")
+    return path
+
+
+def compare_benchmarks(baseline_path, current_path):
+    """Per-stage seconds of two saved reports side by side; Speedup > 1 means current is faster."""
+    frames = []
+    for label, path in (("Baseline", baseline_path), ("Current", current_path)):
+        with open(path) as f:
+            df = pd.DataFrame(json.load(f)["results"])
+        frames.append(df.set_index(["stage", "tokenizer"])[["seconds", "peak_mb"]].add_prefix(f"{label} "))
+    df = frames[0].join(frames[1], how="outer")
+    df["Speedup"] = df["Baseline seconds"] / df["Current seconds"]
+    return df.reset_index()
+
+
+if __name__ == "__main__":
+    # python text_metrics_benchmark.py [size_mb] [tokenizer ...]
+    size = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    report = run_benchmark(size_mb=size, tokenizers=tuple(sys.argv[2:]) or (TEXT_METRICS_TOKENIZER,))
+    print(pd.DataFrame(report["results"]).to_string(index=False))
+    save_benchmark(report)
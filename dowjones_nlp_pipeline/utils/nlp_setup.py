@@ -1,9 +1,10 @@
 # utils/nlp_setup.py
-from nltk.corpus import cmudict, stopwords
+from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
+from utils.syllable_table import load_syllable_table
 
-# Load CMU Pronouncing Dictionary
-d = cmudict.dict()
+# Load precompiled syllable counts (built once from the CMU Pronouncing Dictionary)
+d = load_syllable_table()
 
 # Load stopwords
 stop_words = set(stopwords.words('english'))
@@ -0,0 +1,79 @@
+# utils/syllable_table.py
+import os
+import numpy as np
+from config import SYLLABLE_TABLE_PATH
+
+WORDS_FILE = "words.npy"
+SYLLABLES_FILE = "syllables.npy"
+
+
+class SyllableTable:
+    """
+    Sorted CMU dictionary words with one uint8 syllable count each.
+
+    Both arrays are memory-mapped, so loading is near-instant and the pages are
+    shared between processes that open the same table.
+    """
+
+    def __init__(self, words, syllables, path=None):
+        self.words = words
+        self.syllables = syllables
+        self.path = path
+
+    def get(self, word, default=0):
+        """Syllables in the first CMU pronunciation of word, or default if it is not listed."""
+        try:
+            key = word.encode("ascii")
+        except UnicodeEncodeError:
+            return default
+        i = np.searchsorted(self.words, key)
+        if i < len(self.words) and self.words[i] == key:
+            return int(self.syllables[i])
+        return default
+
+    def __len__(self):
+        return len(self.words)
+
+    def __reduce__(self):
+        # Re-open the memory map in the receiving process instead of pickling the arrays
+        if self.path is not None:
+            return load_syllable_table, (self.path,)
+        return SyllableTable, (self.words, self.syllables)
+
+
+def build_syllable_table(path=SYLLABLE_TABLE_PATH):
+    """One-time build: count syllables for every cmudict entry and write the compact table."""
+    import nltk
+
+    try:
+        nltk.data.find('corpora/cmudict')
+    except LookupError:
+        nltk.download('cmudict')
+
+    pronouncing_dict = nltk.corpus.cmudict.dict()
+    words = sorted(w for w in pronouncing_dict if w.isascii())
+    # Same rule as text_metrics.make_numsyllables: stressed phonemes of the first pronunciation
+    syllables = [sum(1 for x in pronouncing_dict[w][0] if x[-1].isdigit()) for w in words]
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, WORDS_FILE), np.array([w.encode("ascii") for w in words]))
+    np.save(os.path.join(path, SYLLABLES_FILE), np.array(syllables, dtype=np.uint8))
+    print(f"✅ Saved syllable table for {len(words)} words to {path}")
+    return load_syllable_table(path)
+
+
+def load_syllable_table(path=SYLLABLE_TABLE_PATH):
+    """Memory-map the syllable table, building it first if it does not exist yet."""
+    words_path = os.path.join(path, WORDS_FILE)
+    syllables_path = os.path.join(path, SYLLABLES_FILE)
+    if not (os.path.exists(words_path) and os.path.exists(syllables_path)):
+        return build_syllable_table(path)
+    return SyllableTable(
+        np.load(words_path, mmap_mode="r"),
+        np.load(syllables_path, mmap_mode="r"),
+        path=path,
+    )
+
+
+if __name__ == "__main__":
+    build_syllable_table()